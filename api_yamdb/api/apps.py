@@ -3,3 +3,13 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        from django.core.signals import request_started
+        from django.db.backends.signals import connection_created
+
+        from . import signals  # noqa: F401
+        from .db import check_connections, install_query_dispatch
+
+        request_started.connect(check_connections)
+        connection_created.connect(install_query_dispatch)
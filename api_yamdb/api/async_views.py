@@ -0,0 +1,67 @@
+"""
+Асинхронные версии читающих эндпоинтов для ASGI.
+
+Django 3.2 и DRF не умеют асинхронный ORM, поэтому представление
+целиком выполняется в пуле потоков (sync_to_async с
+thread_sensitive=False), а цикл событий тем временем принимает другие
+запросы. Медленный запрос к базе занимает поток пула (ASGI_THREADS),
+а не весь воркер. Под WSGI используются обычные синхронные маршруты.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.urls import URLPattern
+
+from .db import check_connections
+
+# Маршруты роутера, которые под ASGI обслуживаются через пул потоков.
+ASYNC_ROUTES = (
+    'titles-list',
+    'titles-detail',
+    'reviews-list',
+    'reviews-detail',
+    'comments-list',
+    'comments-detail',
+)
+
+
+def call_view(view, request, *args, **kwargs):
+    """
+    Выполняет представление в потоке пула. Сигналы request_started и
+    request_finished обрабатываются в другом потоке, поэтому соединения
+    этого потока проверяются и закрываются по CONN_MAX_AGE здесь.
+    """
+    close_old_connections()
+    check_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def thread_pool_view(view):
+    """Асинхронная обёртка; атрибуты вроде csrf_exempt копируются."""
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        return await sync_to_async(call_view, thread_sensitive=False)(
+            view, request, *args, **kwargs
+        )
+
+    return async_view
+
+
+def async_patterns(patterns):
+    """Копии маршрутов ASYNC_ROUTES с асинхронными представлениями."""
+    return [
+        URLPattern(
+            pattern.pattern,
+            thread_pool_view(pattern.callback),
+            pattern.default_args,
+            pattern.name,
+        )
+        for pattern in patterns if pattern.name in ASYNC_ROUTES
+    ]
@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+from reviews.models import User
+
+from .metrics import cache_result
+
+
+def user_cache_key(user_id):
+    return f'yamdb:user:{user_id}'
+
+
+# Поля, нужные аутентификации и правам доступа. Хэш пароля, e-mail и
+# остальной профиль в общий кэш не попадают.
+CACHED_USER_FIELDS = (
+    'id', 'username', 'role', 'is_staff', 'is_superuser', 'is_active',
+)
+
+
+def invalidate_user(user_id):
+    """
+    Удаляет пользователя из кэша после коммита: до него параллельный
+    запрос прочитал бы и закэшировал прежнюю строку снова.
+    """
+    transaction.on_commit(
+        lambda: caches[settings.USER_CACHE_ALIAS].delete(
+            user_cache_key(user_id)
+        )
+    )
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация, которая берёт пользователя из кэша. В кэше
+    только CACHED_USER_FIELDS, из них собирается несохранённый User:
+    профиль читается из базы по request.user.pk.
+    Запись удаляется при каждом сохранении или удалении пользователя,
+    а в других процессах устаревает не позже USER_CACHE_TIMEOUT,
+    так что смена роли или блокировка вступают в силу в этих пределах.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            )
+        cache = caches[settings.USER_CACHE_ALIAS]
+        key = user_cache_key(user_id)
+        fields = cache.get(key)
+        if fields is None:
+            cache_result('user', 'miss')
+            user = super().get_user(validated_token)
+            cache.set(key, {
+                name: getattr(user, name) for name in CACHED_USER_FIELDS
+            }, settings.USER_CACHE_TIMEOUT)
+        else:
+            cache_result('user', 'hit')
+            user = User(**fields)
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        return user
@@ -0,0 +1,109 @@
+import hashlib
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from .metrics import cache_result
+
+CATEGORIES = 'categories'
+GENRES = 'genres'
+TITLES = 'titles'
+LEADERBOARDS = 'leaderboards'
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def generation_key(resource):
+    return f'yamdb:generation:{resource}'
+
+
+def get_generation(resource):
+    """
+    Текущее поколение ресурса.
+    Если счётчик потерян (вытеснен из кэша), он начинается с текущего
+    времени в микросекундах, чтобы не совпасть с прежними поколениями.
+    """
+    cache = get_cache()
+    key = generation_key(resource)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns() // 1000, timeout=None)
+        return cache.get(key)
+    return generation
+
+
+def fresh_key(resource):
+    return f'yamdb:fresh:{resource}'
+
+
+def bump_generation(*resources):
+    """
+    Инвалидирует закэшированные ответы ресурсов после коммита.
+    При чтении с реплик ресурсы ещё REPLICA_PIN_SECONDS читаются
+    с primary (см. api.routers).
+    """
+    def bump():
+        cache = get_cache()
+        for resource in resources:
+            try:
+                cache.incr(generation_key(resource))
+            except ValueError:
+                get_generation(resource)
+        if settings.DATABASE_REPLICAS:
+            cache.set_many(
+                {fresh_key(resource): True for resource in resources},
+                settings.REPLICA_PIN_SECONDS,
+            )
+    transaction.on_commit(bump)
+
+
+class CachedResponseMixin:
+    """
+    Кэширует ответы list/retrieve для анонимных GET-запросов.
+    Ключ строится из полного URL и поколения ресурса cache_resource,
+    поэтому любое изменение ресурса делает старые ответы недостижимыми.
+    Работает только при RESPONSE_CACHE_ENABLED.
+    """
+    cache_resource = None
+    cached_actions = ('list', 'retrieve')
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            settings.RESPONSE_CACHE_ENABLED and request.method == 'GET'
+            and self.action in self.cached_actions
+        ):
+            self.get = partial(self.cached_response, self.get)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return handler(request, *args, **kwargs)
+        generation = get_generation(self.cache_resource)
+        url_hash = hashlib.md5(
+            request.build_absolute_uri().encode()
+        ).hexdigest()
+        etag = f'"{generation}-{url_hash}"'
+        if etag in request.headers.get('If-None-Match', ''):
+            cache_result('response', 'not_modified')
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag}
+            )
+        cache = get_cache()
+        key = f'yamdb:response:{self.cache_resource}:{generation}:{url_hash}'
+        data = cache.get(key)
+        if data is not None:
+            cache_result('response', 'hit')
+            return Response(data, headers={'ETag': etag})
+        cache_result('response', 'miss')
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+            response['ETag'] = etag
+        return response
@@ -0,0 +1,101 @@
+"""
+Постоянные соединения с базой.
+
+При CONN_MAX_AGE > 0 соединение переживает запрос, и к началу
+следующего сервер мог его уже закрыть (перезапуск, таймаут простоя,
+pgbouncer). Django 3.2 не проверяет его перед использованием, поэтому
+при CONN_HEALTH_CHECKS (так эта настройка называется в Django 4.1+)
+переиспользуемое соединение проверяется перед первым запросом к базе
+и при необходимости закрывается — курсор откроет новое.
+
+Наблюдатели SQL-запросов (метрики, профилирование) подключаются через
+observe_queries: они хранятся в contextvar, поэтому видят запросы и из
+потоков, в которых sync_to_async выполняет представления под ASGI.
+"""
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import partial
+
+from django.conf import settings
+from django.db import connections, transaction
+
+query_observers = ContextVar('query_observers', default=())
+
+
+def dispatch_query(execute, sql, params, many, context):
+    """Постоянная обёртка соединения: передаёт запрос наблюдателям."""
+    for observer in query_observers.get():
+        execute = partial(observer, execute)
+    return execute(sql, params, many, context)
+
+
+def install_query_dispatch(sender, connection, **kwargs):
+    """Обработчик connection_created."""
+    if dispatch_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(dispatch_query)
+
+
+@contextmanager
+def observe_queries(observer):
+    """
+    Передаёт observer все SQL-запросы текущего контекста. Сигнатура
+    observer — как у обёрток connection.execute_wrapper().
+    """
+    token = query_observers.set(query_observers.get() + (observer,))
+    try:
+        yield observer
+    finally:
+        query_observers.reset(token)
+
+
+def install_health_check(connection):
+    """
+    Оборачивает _cursor соединения: первый курсор после
+    check_connections проверяет переиспользуемое соединение.
+    """
+    if getattr(connection, 'health_check_pending', None) is not None:
+        return
+    cursor = connection._cursor
+
+    def checked_cursor(name=None):
+        if connection.health_check_pending:
+            connection.health_check_pending = False
+            if (
+                connection.connection is not None
+                and not connection.in_atomic_block
+                and not connection.is_usable()
+            ):
+                connection.close()
+        return cursor(name)
+
+    connection.health_check_pending = False
+    connection._cursor = checked_cursor
+
+
+def check_connections(**kwargs):
+    """
+    Обработчик request_started. Как CONN_HEALTH_CHECKS в Django 4.1,
+    соединение проверяется лениво: при первом обращении к базе в этом
+    запросе, а не на каждом запросе. Ответы из кэша и 304 базу не
+    трогают и лишнего SELECT 1 не делают.
+    """
+    for connection in connections.all():
+        if (
+            connection.settings_dict.get('CONN_HEALTH_CHECKS')
+            and connection.connection is not None
+        ):
+            install_health_check(connection)
+            connection.health_check_pending = True
+
+
+def cursor_transaction(using=None):
+    """
+    Транзакция для чтения серверным курсором (QuerySet.iterator()).
+    В режиме пулера транзакций (DB_POOLER) курсор, объявленный вне
+    транзакции, переживает её (WITH HOLD), а соединение с сервером к
+    следующему запросу может достаться другому клиенту. Внутри
+    транзакции курсор живёт только в ней, и пулер его не теряет.
+    """
+    if settings.DB_POOLER:
+        return transaction.atomic(using=using)
+    return nullcontext()
@@ -0,0 +1,200 @@
+"""
+Быстрый путь списков только для чтения.
+
+ModelSerializer на каждый объект страницы создаёт экземпляр модели,
+обходит поля через get_attribute и собирает OrderedDict. ReadPlan один
+раз разбирает поля сериализатора: какие столбцы выбрать через values()
+и каким to_representation поля превратить значение. Поддерживаются
+столбцы модели, SlugRelatedField по внешнему ключу, вложенный
+сериализатор внешнего ключа (те же строки, через JOIN) и вложенный
+сериализатор many=True по ManyToManyField (один запрос на страницу,
+как prefetch_related). Для остальных полей план не строится, и
+FastListMixin оставляет обычный путь.
+"""
+from collections import defaultdict
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .profiling import timed_serialization
+from .sparse import ordering_names
+
+
+class PlanError(Exception):
+    """Поле сериализатора нельзя прочитать из строки values()."""
+
+
+def column_reader(column, to_representation):
+    def read(row, related):
+        value = row[column]
+        if value is None:
+            return None
+        return to_representation(value)
+    return read
+
+
+def slug_reader(key, column):
+    def read(row, related):
+        if row[key] is None:
+            return None
+        return row[column]
+    return read
+
+
+def nested_reader(key, plan):
+    def read(row, related):
+        if row[key] is None:
+            return None
+        return plan.represent(row, related)
+    return read
+
+
+def many_reader(name, pk):
+    def read(row, related):
+        return related[name].get(row[pk], [])
+    return read
+
+
+class ManyRelation:
+    """Вложенный сериализатор many=True по ManyToManyField."""
+
+    def __init__(self, model_field, plan):
+        self.model = model_field.related_model
+        self.query_name = model_field.related_query_name()
+        self.plan = plan
+
+    def load(self, pks):
+        """Представления связанных объектов по первичным ключам родителей."""
+        grouped = defaultdict(list)
+        if not pks:
+            return grouped
+        rows = list(self.model._default_manager.filter(**{
+            f'{self.query_name}__in': pks
+        }).values(self.query_name, *self.plan.columns))
+        for row, data in zip(rows, self.plan.render(rows)):
+            grouped[row[self.query_name]].append(data)
+        return grouped
+
+
+class ReadPlan:
+    """
+    План чтения полей сериализатора из строк values(). prefix —
+    путь до модели вложенного сериализатора: 'category__'.
+    """
+
+    def __init__(self, serializer, prefix=''):
+        self.model = serializer.Meta.model
+        self.prefix = prefix
+        self.pk = prefix + self.model._meta.pk.attname
+        self.columns = [self.pk]
+        self.readers = []
+        self.many = {}
+        for name, field in serializer.fields.items():
+            if not field.write_only:
+                self.readers.append((name, self.compile(name, field)))
+
+    def model_field(self, field):
+        if field.source == '*' or '.' in field.source:
+            raise PlanError(field.source)
+        try:
+            return self.model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            raise PlanError(field.source)
+
+    def add_column(self, column):
+        if column not in self.columns:
+            self.columns.append(column)
+        return column
+
+    def compile(self, name, field):
+        """Функция read(row, related), возвращающая значение поля."""
+        model_field = self.model_field(field)
+        if isinstance(field, serializers.ListSerializer):
+            if self.prefix or not model_field.many_to_many:
+                raise PlanError(name)
+            self.many[name] = ManyRelation(
+                model_field, nested_plan(field.child)
+            )
+            return many_reader(name, self.pk)
+        if not model_field.concrete:
+            raise PlanError(name)
+        key = self.add_column(self.prefix + model_field.attname)
+        if model_field.many_to_one:
+            return self.compile_relation(name, field, model_field, key)
+        if model_field.is_relation or isinstance(
+            field, (serializers.BaseSerializer, serializers.RelatedField)
+        ):
+            raise PlanError(name)
+        return column_reader(key, field.to_representation)
+
+    def compile_relation(self, name, field, model_field, key):
+        """Внешний ключ: вложенный сериализатор или SlugRelatedField."""
+        prefix = f'{self.prefix}{model_field.name}__'
+        if isinstance(field, serializers.BaseSerializer):
+            plan = nested_plan(field, prefix)
+            if plan.many:
+                raise PlanError(name)
+            for column in plan.columns:
+                self.add_column(column)
+            return nested_reader(key, plan)
+        if isinstance(field, serializers.SlugRelatedField):
+            return slug_reader(key, self.add_column(prefix + field.slug_field))
+        raise PlanError(name)
+
+    def represent(self, row, related):
+        return {name: read(row, related) for name, read in self.readers}
+
+    def render(self, rows):
+        """Представления строк values() в порядке строк."""
+        rows = list(rows)
+        pks = [row[self.pk] for row in rows]
+        related = {
+            name: relation.load(pks) for name, relation in self.many.items()
+        }
+        return [self.represent(row, related) for row in rows]
+
+
+def nested_plan(serializer, prefix=''):
+    # Переопределённое представление вложенного сериализатора
+    # план повторить не может.
+    if (
+        type(serializer).to_representation
+        is not serializers.Serializer.to_representation
+    ):
+        raise PlanError(type(serializer).__name__)
+    return ReadPlan(serializer, prefix)
+
+
+class FastListMixin:
+    """
+    list через ReadPlan: страница читается одним values() и собирается
+    в словари без экземпляров моделей и полей DRF. Ответ совпадает с
+    обычным путём; to_representation корневого сериализатора не
+    вызывается, поэтому он не должен менять представление списка.
+    """
+
+    def get_read_plan(self):
+        """План сериализатора списка или None для обычного пути."""
+        try:
+            return ReadPlan(self.get_serializer())
+        except PlanError:
+            return None
+
+    def list(self, request, *args, **kwargs):
+        plan = self.get_read_plan()
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        available = {
+            field.name for field in queryset.model._meta.concrete_fields
+        } | set(queryset.query.annotations)
+        rows = queryset.prefetch_related(None).values(*plan.columns, *(
+            ordering_names(self, queryset) & available
+        ).difference(plan.columns))
+        page = self.paginate_queryset(rows)
+        with timed_serialization():
+            data = plan.render(rows if page is None else page)
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
@@ -1,17 +1,73 @@
 import django_filters
+from django.db.models import Exists, OuterRef
+from rest_framework import filters
 from reviews.models import Title
+from reviews.search import search_titles
+
+
+class SlugInFilter(django_filters.BaseInFilter, django_filters.CharFilter):
+    """Несколько слагов через запятую: ?genre=drama,comedy."""
 
 
 class TitleFilter(django_filters.FilterSet):
-    genre = django_filters.Filter(
-        field_name='genre__slug',
-        lookup_expr='icontains'
+    ANY = 'any'
+    ALL = 'all'
+
+    genre = SlugInFilter(method='filter_genre')
+    genre_match = django_filters.ChoiceFilter(
+        choices=((ANY, ANY), (ALL, ALL)),
+        method='filter_genre_match',
     )
-    category = django_filters.Filter(
+    category = SlugInFilter(
         field_name='category__slug',
-        lookup_expr='icontains'
+        lookup_expr='in'
+    )
+    min_rating = django_filters.NumberFilter(
+        field_name='rating',
+        lookup_expr='gte'
+    )
+    max_rating = django_filters.NumberFilter(
+        field_name='rating',
+        lookup_expr='lte'
     )
 
     class Meta:
-        fields = ('genre', 'name', 'year', 'category')
+        fields = ('genre', 'genre_match', 'name', 'year', 'category',
+                  'min_rating', 'max_rating')
         model = Title
+
+    def filter_genre(self, queryset, name, value):
+        """
+        Точное совпадение слагов жанров через EXISTS по связующей
+        таблице: строки произведений не размножаются и DISTINCT не нужен.
+        По умолчанию достаточно любого из жанров, с genre_match=all —
+        нужны все.
+        """
+        genres = Title.genre.through.objects.filter(title=OuterRef('pk'))
+        if self.form.cleaned_data.get('genre_match') == self.ALL:
+            for slug in set(value):
+                queryset = queryset.filter(
+                    Exists(genres.filter(genre__slug=slug))
+                )
+            return queryset
+        return queryset.filter(Exists(genres.filter(genre__slug__in=value)))
+
+    def filter_genre_match(self, queryset, name, value):
+        return queryset
+
+
+class TitleSearchFilter(filters.SearchFilter):
+    """
+    Полнотекстовый поиск по названию, описанию и отзывам.
+    Без явного ?ordering= результаты сортируются по релевантности.
+    """
+    ordering_param = filters.OrderingFilter.ordering_param
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        queryset = search_titles(queryset, terms)
+        if self.ordering_param in request.query_params:
+            return queryset
+        return queryset.order_by('-search_rank', *queryset.query.order_by)
@@ -0,0 +1,124 @@
+"""
+Метрики Prometheus для /metrics.
+
+Под gunicorn каждый воркер — отдельный процесс, поэтому задаётся
+PROMETHEUS_MULTIPROC_DIR: процессы пишут значения в файлы этого
+каталога, а /metrics собирает их MultiProcessCollector. Каталог
+очищается при старте мастера и в child_exit (см. gunicorn.conf.py).
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY,
+                               CollectorRegistry, Counter, Gauge, Histogram,
+                               generate_latest, multiprocess)
+
+from .db import observe_queries
+from .middleware import SyncAndAsyncMiddleware
+
+REQUESTS = Counter(
+    'yamdb_http_requests_total',
+    'Запросы по представлениям.',
+    ['view', 'method', 'status'],
+)
+LATENCY = Histogram(
+    'yamdb_http_request_duration_seconds',
+    'Время обработки запроса.',
+    ['view', 'method'],
+    buckets=(
+        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+    ),
+)
+DB_QUERIES = Histogram(
+    'yamdb_db_queries_per_request',
+    'Число SQL-запросов на запрос.',
+    ['view'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+DB_TIME = Histogram(
+    'yamdb_db_duration_seconds_per_request',
+    'Суммарное время SQL-запросов на запрос.',
+    ['view'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+CACHE = Counter(
+    'yamdb_cache_requests_total',
+    'Обращения к кэшам: hit, miss или not_modified (304 по ETag).',
+    ['cache', 'result'],
+)
+IN_PROGRESS = Gauge(
+    'yamdb_http_requests_in_progress',
+    'Запросы в обработке; вместе с yamdb_workers даёт загрузку воркеров.',
+    multiprocess_mode='livesum',
+)
+WORKERS = Gauge(
+    'yamdb_workers',
+    'Живые процессы приложения.',
+    multiprocess_mode='livesum',
+)
+
+
+def cache_result(cache, result):
+    CACHE.labels(cache, result).inc()
+
+
+class QueryCounter:
+    """Наблюдатель, считающий SQL-запросы и их время."""
+
+    def __init__(self):
+        self.queries = 0
+        self.time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.time += time.perf_counter() - start
+
+
+class MetricsMiddleware(SyncAndAsyncMiddleware):
+    """Собирает метрики запросов; меткой view служит имя маршрута."""
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        WORKERS.set(1)
+
+    @contextmanager
+    def wrap(self, request):
+        start = time.perf_counter()
+        with IN_PROGRESS.track_inprogress(), observe_queries(
+            QueryCounter()
+        ) as counter:
+            yield counter
+        counter.duration = time.perf_counter() - start
+
+    def process_response(self, request, response, counter):
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        LATENCY.labels(view, request.method).observe(counter.duration)
+        REQUESTS.labels(view, request.method, response.status_code).inc()
+        DB_QUERIES.labels(view).observe(counter.queries)
+        DB_TIME.labels(view).observe(counter.time)
+        return response
+
+
+def get_registry():
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_view(request):
+    return HttpResponse(
+        generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST
+    )
@@ -0,0 +1,37 @@
+import asyncio
+from contextlib import nullcontext
+
+
+class SyncAndAsyncMiddleware:
+    """
+    Основа для middleware, работающих и под WSGI, и под ASGI без
+    переключения потоков. Подклассы задают wrap() — контекст вокруг
+    обработки запроса — и process_response().
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Так Django 3.2 распознаёт асинхронный экземпляр.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        with self.wrap(request) as state:
+            response = self.get_response(request)
+        return self.process_response(request, response, state)
+
+    async def __acall__(self, request):
+        with self.wrap(request) as state:
+            response = await self.get_response(request)
+        return self.process_response(request, response, state)
+
+    def wrap(self, request):
+        return nullcontext()
+
+    def process_response(self, request, response, state):
+        return response
@@ -0,0 +1,66 @@
+from functools import partial
+
+from django.core.paginator import Paginator
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+MAX_PAGE_SIZE = 100
+
+
+class KeysetPagination(CursorPagination):
+    """Курсорная пагинация по индексированным полям без COUNT и OFFSET."""
+    ordering = '-id'
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        has_ordering_filter = any(
+            hasattr(backend, 'get_ordering')
+            for backend in getattr(view, 'filter_backends', ())
+        )
+        if has_ordering_filter:
+            return super().get_ordering(request, queryset, view)
+        ordering = getattr(view, 'ordering', None) or self.ordering
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
+
+
+class CountedPaginator(Paginator):
+    """Paginator с заранее известным числом объектов, без COUNT."""
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count = count
+
+
+class PageNumberOrCursorPagination(PageNumberPagination):
+    """
+    Постраничная пагинация с возможностью перейти на курсорную.
+    Курсорный режим включается параметром cursor (для первой
+    страницы — пустым: ?cursor=), дальше клиент идёт по ссылкам next.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+    cursor_query_param = 'cursor'
+    cursor_pagination_class = KeysetPagination
+
+    cursor_paginator = None
+    # Число объектов, если представление уже знает его (NestedListMixin).
+    object_count = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param in request.query_params:
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        if self.object_count is not None:
+            self.django_paginator_class = partial(
+                CountedPaginator, count=self.object_count
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,154 @@
+"""
+Профилирование запросов: число SQL-запросов, время в базе, самые
+медленные запросы и время сериализации.
+
+Включается настройкой REQUEST_PROFILING. Выключенный ProfilingMiddleware
+бросает MiddlewareNotUsed и не попадает в цепочку обработчиков, а
+сериализаторы не оборачиваются, так что накладных расходов нет.
+"""
+import heapq
+import json
+import logging
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework import serializers
+
+from .db import observe_queries
+from .middleware import SyncAndAsyncMiddleware
+
+logger = logging.getLogger(__name__)
+
+current_profile = ContextVar('current_profile', default=None)
+
+# Последние профили процесса для /api/v1/profiling/.
+samples = deque(maxlen=settings.REQUEST_PROFILING_BUFFER_SIZE)
+
+
+class RequestProfile:
+    """Метрики одного запроса."""
+
+    def __init__(self, request):
+        self.method = request.method
+        self.path = request.path
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+        self.slowest = []
+        self.started = time.perf_counter()
+        self.total_time = 0.0
+
+    def execute(self, execute, sql, params, many, context):
+        """Наблюдатель SQL-запросов (api.db.observe_queries)."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.queries += 1
+            self.db_time += duration
+            entry = (duration, self.queries, sql)
+            if len(self.slowest) < settings.REQUEST_PROFILING_SLOW_QUERIES:
+                heapq.heappush(self.slowest, entry)
+            else:
+                heapq.heappushpop(self.slowest, entry)
+
+    def finish(self, status_code):
+        self.status_code = status_code
+        self.total_time = time.perf_counter() - self.started
+
+    def as_dict(self):
+        return {
+            'method': self.method,
+            'path': self.path,
+            'status': self.status_code,
+            'total_ms': round(self.total_time * 1000, 3),
+            'queries': self.queries,
+            'db_ms': round(self.db_time * 1000, 3),
+            'serializer_ms': round(self.serializer_time * 1000, 3),
+            'slowest_queries': [
+                {'ms': round(duration * 1000, 3), 'sql': sql}
+                for duration, _, sql in sorted(self.slowest, reverse=True)
+            ],
+        }
+
+    def server_timing(self):
+        return ', '.join((
+            f'db;dur={self.db_time * 1000:.3f};desc="{self.queries} queries"',
+            f'serializer;dur={self.serializer_time * 1000:.3f}',
+            f'total;dur={self.total_time * 1000:.3f}',
+        ))
+
+
+@contextmanager
+def timed_serialization():
+    """Считает время блока в serializer_time текущего профиля."""
+    profile = current_profile.get()
+    if profile is None:
+        yield
+        return
+    profile.serializer_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.serializer_depth -= 1
+        if not profile.serializer_depth:
+            profile.serializer_time += time.perf_counter() - start
+
+
+def timed_data(data):
+    """Считает время property data сериализатора в текущий профиль."""
+
+    def wrapper(serializer):
+        with timed_serialization():
+            return data(serializer)
+
+    wrapper.profiled = True
+    return wrapper
+
+
+def instrument_serializers():
+    data = serializers.BaseSerializer.data.fget
+    if not getattr(data, 'profiled', False):
+        serializers.BaseSerializer.data = property(timed_data(data))
+
+
+class ProfilingMiddleware(SyncAndAsyncMiddleware):
+    """
+    Пишет метрики запроса в заголовок Server-Timing и строкой JSON в лог
+    api.profiling, доля REQUEST_PROFILING_SAMPLE_RATE запросов попадает
+    в кольцевой буфер samples. Запросы потоковых ответов, выполняемые
+    после возврата из представления, не учитываются.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILING:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        instrument_serializers()
+
+    @contextmanager
+    def wrap(self, request):
+        profile = RequestProfile(request)
+        token = current_profile.set(profile)
+        try:
+            with observe_queries(profile.execute):
+                yield profile
+        finally:
+            current_profile.reset(token)
+
+    def process_response(self, request, response, profile):
+        profile.finish(response.status_code)
+        response['Server-Timing'] = profile.server_timing()
+        data = profile.as_dict()
+        logger.info(json.dumps(data, ensure_ascii=False))
+        if random.random() < settings.REQUEST_PROFILING_SAMPLE_RATE:
+            samples.append(data)
+        return response
@@ -0,0 +1,59 @@
+import orjson
+from rest_framework import renderers
+
+# Даты, время и всё, чего orjson не знает, кодирует JSONEncoder DRF:
+# так форматы совпадают с JSONRenderer.
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+)
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer на orjson с тем же компактным выводом байт в байт.
+    Отступы (?indent, браузерный API), ensure_ascii и данные, которые
+    orjson не кодирует (нестроковые ключи, целые больше 64 бит),
+    рендерит стандартный JSONRenderer. Отличаются только float вне
+    [1e-4, 1e16): orjson пишет 1e16 вместо 1e+16, в ответах API таких
+    чисел нет.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            data is None or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+            is not None
+        ):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default,
+                option=ORJSON_OPTIONS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        # Как JSONRenderer: U+2028 и U+2029 экранируются.
+        return ret.replace(
+            b'\xe2\x80\xa8', b'\\u2028'
+        ).replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class NDJSONRenderer(renderers.BaseRenderer):
+    """
+    JSON Lines: один объект на строку. Только для выбора формата
+    выгрузки: поток строит api.export, ошибки отдаются в JSON.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+
+class CSVRenderer(renderers.BaseRenderer):
+    """CSV выгрузки, как и NDJSONRenderer — только для выбора формата."""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
@@ -0,0 +1,91 @@
+"""
+Чтение с реплик для безопасных запросов.
+
+ReplicaReadMixin включает чтение с реплик на время GET-запроса к
+вьюсету, ReplicaRouter направляет такие чтения на случайную реплику из
+DATABASE_REPLICAS. Всё остальное — записи, аутентификация, пользователи,
+запросы вне вьюсетов с миксином — идёт в default.
+
+Чтобы пользователь видел свои изменения, после успешного небезопасного
+запроса PrimaryPinMiddleware на REPLICA_PIN_SECONDS закрепляет его за
+primary. Ресурсы с кэшем ответов (cache_resource) после изменения так
+же читаются с primary всеми, иначе отстающая реплика попала бы в кэш
+под новым поколением.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework.permissions import SAFE_METHODS
+
+from .cache import fresh_key, get_cache
+from .middleware import SyncAndAsyncMiddleware
+
+replica_reads = ContextVar('replica_reads', default=False)
+
+
+def pin_key(user_id):
+    return f'yamdb:pin:{user_id}'
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if replica_reads.get() and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и primary.
+        return True
+
+
+class ReplicaReadMixin:
+    """Читает с реплик в безопасных запросах к вьюсету."""
+
+    def dispatch(self, request, *args, **kwargs):
+        token = replica_reads.set(False)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            replica_reads.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and settings.DATABASE_REPLICAS:
+            replica_reads.set(self.can_read_replica(request))
+
+    def can_read_replica(self, request):
+        keys = []
+        if request.user.is_authenticated:
+            keys.append(pin_key(request.user.pk))
+        resource = getattr(self, 'cache_resource', None)
+        if resource is not None:
+            keys.append(fresh_key(resource))
+        return not keys or not get_cache().get_many(keys)
+
+
+class PrimaryPinMiddleware(SyncAndAsyncMiddleware):
+    """Закрепляет за primary пользователя, который что-то изменил."""
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def process_response(self, request, response, state):
+        user = getattr(request, 'user', None)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and user is not None
+            and user.is_authenticated
+        ):
+            get_cache().set(
+                pin_key(user.pk), True, settings.REPLICA_PIN_SECONDS
+            )
+        return response
@@ -1,17 +1,23 @@
 import datetime
 
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
 from rest_framework import serializers
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from rest_framework.settings import api_settings
+from reviews.models import (Category, Comment, Genre, LeaderboardEntry, Review,
+                            Title, User)
 
+from .sparse import SparseFieldsMixin
 
-class CategorySerializer(serializers.ModelSerializer):
+
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         exclude = ('id',)
         model = Category
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         exclude = ('id',)
         model = Genre
@@ -40,18 +46,232 @@ class TitleSerializer(serializers.ModelSerializer):
                   'rating', 'category', 'genre')
 
 
-class TitleShowSerializer(serializers.ModelSerializer):
-    """Сериализатор для SAFE METHODS"""
+RECENT_REVIEWS = 5
+
+
+class TitleShowSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    Сериализатор для SAFE METHODS. Разделы из context['expand']
+    добавляются к ответу и выбираются ?fields= и ?omit= наравне с
+    полями: reviews — количество отзывов, распределение оценок и
+    RECENT_REVIEWS последних отзывов.
+    """
     category = CategorySerializer(required=False)
     genre = GenreSerializer(many=True, required=False)
     rating = serializers.IntegerField(read_only=True)
 
+    expandable = ('reviews',)
+
+    class Meta:
+        model = Title
+        fields = ('id', 'name', 'year', 'description',
+                  'rating', 'category', 'genre')
+
+    def get_extra_names(self):
+        expand = self.context.get('expand', ())
+        return [name for name in self.expandable if name in expand]
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        for name in self.get_extra_names():
+            if name not in self.excluded:
+                data[name] = getattr(self, f'get_{name}')(instance)
+        return data
+
+    def get_reviews(self, title):
+        recent = title.reviews.select_related('author').order_by(
+            '-pub_date', '-id'
+        )[:RECENT_REVIEWS]
+        return {
+            'count': title.reviews_count,
+            'scores': title.score_histogram,
+            'recent': ReviewSerializer(
+                recent, many=True, context=self.context
+            ).data,
+        }
+
+
+class LeaderboardTitleSerializer(serializers.ModelSerializer):
+    rating = serializers.IntegerField(read_only=True)
+
     class Meta:
         model = Title
-        fields = '__all__'
+        fields = ('id', 'name', 'year', 'rating', 'reviews_count')
+
+
+class LeaderboardEntrySerializer(
+    SparseFieldsMixin, serializers.ModelSerializer
+):
+    title = LeaderboardTitleSerializer(read_only=True)
+
+    class Meta:
+        model = LeaderboardEntry
+        fields = ('position', 'value', 'title')
+
+
+BATCH_MAX_SIZE = 1000
+
+
+def bulk_create_returning(model, objects):
+    """
+    bulk_create с заполнением первичных ключей. Если база не умеет
+    возвращать id из массовой вставки, объекты сохраняются по одному
+    (вызывающий код всё равно работает в одной транзакции).
+    """
+    if connection.features.can_return_rows_from_bulk_insert:
+        return model.objects.bulk_create(objects)
+    for obj in objects:
+        obj.save(force_insert=True)
+    return objects
+
+
+class BatchListSerializer(serializers.ListSerializer):
+    """
+    Пакетная запись: элементы проверяются по отдельности, связи —
+    одним запросом на весь пакет, ошибки возвращаются списком
+    по позициям элементов.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list) or not data:
+            return super().to_internal_value(data)
+        if len(data) > BATCH_MAX_SIZE:
+            raise serializers.ValidationError({
+                'non_field_errors': [
+                    f'Не больше {BATCH_MAX_SIZE} элементов за запрос.'
+                ]
+            })
+        items = []
+        errors = []
+        for item in data:
+            try:
+                items.append(self.child.run_validation(item))
+                errors.append({})
+            except serializers.ValidationError as exc:
+                items.append(None)
+                errors.append(exc.detail)
+        valid = [
+            (item, error) for item, error in zip(items, errors)
+            if item is not None
+        ]
+        if valid:
+            self.validate_batch(*zip(*valid))
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    def validate_batch(self, items, errors):
+        """Проверки всего пакета; дополняет словари ошибок элементов."""
+
+
+class TitleBatchListSerializer(BatchListSerializer):
+    does_not_exist = serializers.SlugRelatedField.default_error_messages[
+        'does_not_exist'
+    ]
+
+    def validate_batch(self, items, errors):
+        categories = dict(Category.objects.filter(
+            slug__in={item['category'] for item in items}
+        ).values_list('slug', 'id'))
+        genres = dict(Genre.objects.filter(
+            slug__in={slug for item in items for slug in item['genre']}
+        ).values_list('slug', 'id'))
+        for item, error in zip(items, errors):
+            if item['category'] not in categories:
+                error['category'] = [self.does_not_exist.format(
+                    slug_name='slug', value=item['category']
+                )]
+            missing = [slug for slug in item['genre'] if slug not in genres]
+            if missing:
+                error['genre'] = [
+                    self.does_not_exist.format(slug_name='slug', value=slug)
+                    for slug in missing
+                ]
+            item['category_id'] = categories.get(item.pop('category'))
+            item['genre_ids'] = {genres.get(slug) for slug in item['genre']}
+
+    def create(self, validated_data):
+        titles = bulk_create_returning(Title, [
+            Title(
+                name=item['name'],
+                year=item['year'],
+                description=item.get('description'),
+                category_id=item['category_id'],
+            )
+            for item in validated_data
+        ])
+        Title.genre.through.objects.bulk_create([
+            Title.genre.through(title_id=title.id, genre_id=genre_id)
+            for title, item in zip(titles, validated_data)
+            for genre_id in item['genre_ids']
+        ])
+        return titles
+
+
+class TitleBatchSerializer(serializers.Serializer):
+    """Элемент пакетного создания произведений."""
+    name = serializers.CharField(max_length=256)
+    year = serializers.IntegerField()
+    description = serializers.CharField(
+        max_length=256, required=False, allow_null=True, allow_blank=True
+    )
+    category = serializers.SlugField()
+    genre = serializers.ListField(child=serializers.SlugField())
 
+    validate_year = TitleSerializer.validate_year
 
-class ReviewSerializer(serializers.ModelSerializer):
+    class Meta:
+        list_serializer_class = TitleBatchListSerializer
+
+
+class ReviewBatchListSerializer(BatchListSerializer):
+
+    def validate_batch(self, items, errors):
+        author = self.context['request'].user
+        title_ids = {item['title'] for item in items}
+        existing = set(Title.objects.filter(
+            pk__in=title_ids
+        ).values_list('pk', flat=True))
+        reviewed = set(Review.objects.filter(
+            author=author, title_id__in=title_ids
+        ).values_list('title_id', flat=True))
+        for item, error in zip(items, errors):
+            if item['title'] not in existing:
+                error['title'] = ['Произведение не найдено.']
+            elif item['title'] in reviewed:
+                error['title'] = [
+                    'Вы уже оставляли отзыв на данное произведение'
+                ]
+            reviewed.add(item['title'])
+
+    def create(self, validated_data):
+        author = self.context['request'].user
+        title_ids = {item['title'] for item in validated_data}
+        reviews = [
+            Review(
+                title_id=item['title'],
+                author=author,
+                text=item['text'],
+                score=item['score'],
+            )
+            for item in validated_data
+        ]
+        bulk_create_returning(Review, reviews)
+        Title.objects.filter(pk__in=title_ids).update_rating()
+        return reviews
+
+
+class ReviewBatchSerializer(serializers.Serializer):
+    """Элемент пакетного создания отзывов текущего пользователя."""
+    title = serializers.IntegerField()
+    text = serializers.CharField()
+    score = serializers.IntegerField(min_value=1, max_value=10)
+
+    class Meta:
+        list_serializer_class = ReviewBatchListSerializer
+
+
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field='username'
     )
@@ -73,7 +293,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True,
         slug_field='username',
@@ -84,7 +304,7 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор данных для модели User."""
 
     class Meta:
@@ -129,27 +349,69 @@ class RegistrationSerializer(serializers.Serializer):
         1) Username "me" запрещен
         2) Неуникальный username запрещен
         3) Неуникальный email запрещен
+        Повторная регистрация с теми же username и email разрешена.
         """
-        username = data.get('username')
-        email = data.get('email')
-        if username == 'me':
+        if data['username'] == 'me':
             raise serializers.ValidationError(
                 'Нельзя использовать "me" в качестве имени пользователя.'
             )
-        if User.objects.filter(username=username, email=email).exists():
-            return data
-        if User.objects.filter(username=username).exists():
-            raise serializers.ValidationError(
-                'Другой пользователь с таким username уже существует.'
-            )
-        if User.objects.filter(email=email).exists():
+        self.existing_user = self.find_user(data)
+        return data
+
+    def find_user(self, data):
+        """
+        Ищет конфликты username и email одним запросом. Возвращает
+        пользователя с теми же username и email или None.
+        """
+        username = data['username']
+        email = data['email']
+        users = User.objects.filter(Q(username=username) | Q(email=email))
+        for user in users:
+            if user.username == username and user.email == email:
+                return user
+        for user in users:
+            if user.username == username:
+                raise serializers.ValidationError(
+                    'Другой пользователь с таким username уже существует.'
+                )
+        if users:
             raise serializers.ValidationError(
                 'Другой пользователь с таким email уже существует.'
             )
-        return data
-
+        return None
 
-class EditSelfProfileSerializer(serializers.ModelSerializer):
+    def create(self, validated_data):
+        """
+        Создаёт пользователя без предварительной проверки: гонку
+        одновременных регистраций разрешают уникальные индексы.
+        """
+        if self.existing_user is not None:
+            return self.existing_user
+        try:
+            with transaction.atomic():
+                return User.objects.create(**validated_data)
+        except IntegrityError:
+            try:
+                user = self.find_user(validated_data)
+            except serializers.ValidationError as exc:
+                # Ошибки save() DRF не оборачивает в non_field_errors,
+                # как ошибки validate().
+                raise serializers.ValidationError(
+                    {api_settings.NON_FIELD_ERRORS_KEY: exc.detail}
+                )
+        if user is None:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Не удалось зарегистрировать пользователя, '
+                    'повторите запрос.'
+                ]
+            })
+        return user
+
+
+class EditSelfProfileSerializer(
+    SparseFieldsMixin, serializers.ModelSerializer
+):
     """Сериализатор данных при редактировании профиля пользователя."""
 
     class Meta:
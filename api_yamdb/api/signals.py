@@ -0,0 +1,35 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from reviews.models import Category, Genre, GenreTitle, Review, Title, User
+
+from .authentication import invalidate_user
+from .cache import CATEGORIES, GENRES, TITLES, bump_generation
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_categories(sender, **kwargs):
+    bump_generation(CATEGORIES, TITLES)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_genres(sender, **kwargs):
+    bump_generation(GENRES, TITLES)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(m2m_changed, sender=Title.genre.through)
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_titles(sender, **kwargs):
+    bump_generation(TITLES)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
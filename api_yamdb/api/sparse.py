@@ -0,0 +1,156 @@
+"""
+Выбор полей ответа: ?fields=id,name оставляет только перечисленные
+поля, ?omit=description убирает перечисленные.
+
+SparseFieldsMixin сериализатора сужает ответ GET-запроса, вложенные
+сериализаторы отдаются целиком. SparseFieldsViewMixin вьюсета сужает
+и запрос к базе: only() по выбранным полям модели, select_related и
+prefetch_related только для выбранных связей.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import ListSerializer
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def split_names(value):
+    return [name for name in (value or '').split(',') if name]
+
+
+def is_sparse(request):
+    """Выбраны ли поля ответа в безопасном запросе."""
+    return (
+        request is not None
+        and request.method in SAFE_METHODS
+        and any(
+            split_names(request.query_params.get(param))
+            for param in (FIELDS_PARAM, OMIT_PARAM)
+        )
+    )
+
+
+def select_fields(request, names):
+    """
+    Имена из names, выбранные параметрами запроса, в исходном порядке;
+    None, если выбора нет.
+    """
+    if not is_sparse(request):
+        return None
+    fields = split_names(request.query_params.get(FIELDS_PARAM))
+    omit = split_names(request.query_params.get(OMIT_PARAM))
+    errors = {
+        param: [f'Неизвестное поле: {name}' for name in unknown]
+        for param, unknown in (
+            (FIELDS_PARAM, [name for name in fields if name not in names]),
+            (OMIT_PARAM, [name for name in omit if name not in names]),
+        )
+        if unknown
+    }
+    if errors:
+        raise ValidationError(errors)
+    return [
+        name for name in names
+        if (not fields or name in fields) and name not in omit
+    ]
+
+
+def ordering_names(view, queryset):
+    """
+    Поля сортировки запроса и представления: по ним курсорная
+    пагинация вычисляет позицию, поэтому их нужно читать из базы.
+    """
+    ordering = [
+        *queryset.query.order_by, *(getattr(view, 'ordering', None) or ())
+    ]
+    return {name.lstrip('-') for name in ordering if isinstance(name, str)}
+
+
+class SparseFieldsMixin:
+    """
+    Поля сериализатора по ?fields= и ?omit=. Выбор применяется только к
+    сериализатору, который создало представление (sparse_fields ставит
+    SparseSerializerViewMixin): вложенные и вспомогательные сериализаторы
+    с тем же контекстом отдаются целиком. get_extra_names — разделы
+    ответа помимо полей, которые тоже можно выбрать; невыбранные
+    попадают в excluded.
+    """
+    sparse_fields = False
+    excluded = frozenset()
+
+    def get_extra_names(self):
+        return []
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.sparse_fields:
+            return fields
+        extra = self.get_extra_names()
+        selected = select_fields(
+            self.context.get('request'), [*fields, *extra]
+        )
+        if selected is None:
+            return fields
+        self.excluded = frozenset(extra).difference(selected)
+        return {name: fields[name] for name in selected if name in fields}
+
+
+class SparseSerializerViewMixin:
+    """Включает выбор полей у сериализатора ответа представления."""
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        root = serializer
+        if isinstance(root, ListSerializer):
+            root = root.child
+        if isinstance(root, SparseFieldsMixin):
+            root.sparse_fields = True
+        return serializer
+
+
+class SparseFieldsViewMixin(SparseSerializerViewMixin):
+    """
+    Загружает связи select_related_fields и prefetch_related_fields,
+    если они есть среди полей ответа, а при выборе полей читает только
+    нужные столбцы. Если в ответ входят разделы get_extra_names, их
+    данные неизвестны, и столбцы не сужаются.
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer = self.get_serializer()
+        fields = serializer.fields
+        sources = {field.source.split('.')[0] for field in fields.values()}
+        related = [
+            name for name in self.select_related_fields if name in sources
+        ]
+        # select_related() без аргументов присоединил бы все связи.
+        if related:
+            queryset = queryset.select_related(*related)
+        queryset = queryset.prefetch_related(*(
+            name for name in self.prefetch_related_fields if name in sources
+        ))
+        extra = getattr(serializer, 'get_extra_names', list)()
+        if not is_sparse(self.request) or extra:
+            return queryset
+        return self.only_columns(queryset, sources)
+
+    def only_columns(self, queryset, sources):
+        model = queryset.model
+        concrete = {field.name for field in model._meta.concrete_fields}
+        columns = {model._meta.pk.name} | (
+            ordering_names(self, queryset) & concrete
+        )
+        for source in sources:
+            try:
+                model._meta.get_field(source)
+            except FieldDoesNotExist:
+                # Свойство или метод модели: нужные им поля неизвестны.
+                return queryset
+            if source in concrete:
+                columns.add(source)
+        return queryset.only(*columns)
@@ -1,9 +1,12 @@
 from django.urls import include, path
 from rest_framework import routers
+from reviews.models import LeaderboardEntry
 
-from .views import (CategoriesViewSet, CommentViewSet, GenresViewSet,
+from .async_views import async_patterns
+from .views import (CategoriesViewSet, CommentViewSet, ExportView,
+                    GenresViewSet, LeaderboardViewSet, ProfilingView,
                     ReviewViewSet, TitlesViewSet, UserViewSet, get_token,
-                    register)
+                    register, reviews_batch)
 
 router = routers.DefaultRouter()
 router.register('categories', CategoriesViewSet, basename='categories')
@@ -20,9 +23,30 @@ router.register(
     basename='comments',
 )
 router.register('users', UserViewSet, basename='users')
+router.register(
+    r'leaderboards/(?P<board>{})'.format(
+        '|'.join(board for board, _ in LeaderboardEntry.BOARDS)
+    ),
+    LeaderboardViewSet,
+    basename='leaderboards',
+)
 
 urlpatterns = [
     path('v1/', include(router.urls)),
     path('v1/auth/signup/', register, name='register'),
     path('v1/auth/token/', get_token, name='token'),
+    path('v1/reviews/batch/', reviews_batch, name='reviews-batch'),
+    path('v1/profiling/', ProfilingView.as_view(), name='profiling'),
+]
+
+# Под ASGI (api_yamdb/urls_asgi.py) асинхронные маршруты идут первыми.
+# Выгрузки нет: ASGIHandler Django 3.2 перебирает потоковый ответ в
+# цикле событий, где её серверный курсор запрещён, и клиент получил бы
+# 200 с пустым телом.
+asgi_urlpatterns = [
+    path('v1/', include(async_patterns(router.urls))),
+] + urlpatterns
+
+urlpatterns += [
+    path('v1/export/<str:resource>/', ExportView.as_view(), name='export'),
 ]
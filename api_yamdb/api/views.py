@@ -1,30 +1,48 @@
+from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import transaction
+from django.db.models import Count
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_datetime
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import (AllowAny, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 from rest_framework_simplejwt.tokens import AccessToken
-from reviews.models import Category, Genre, Review, Title, User
+from reviews.leaderboards import ALL, category_scope, genre_scope
+from reviews.models import (Category, Comment, Genre, LeaderboardEntry,
+                            OutgoingEmail, Review, Title, User)
 
-from .filters import TitleFilter
+from . import profiling
+from .cache import (CATEGORIES, GENRES, LEADERBOARDS, TITLES,
+                    CachedResponseMixin, bump_generation)
+from .export import EXPORT_FIELDS, export_rows, stream_csv, stream_ndjson
+from .fast import FastListMixin
+from .filters import TitleFilter, TitleSearchFilter
 from .permissions import IsAdmin, IsAdminOrReadOnly, IsAuthorOrHigherOrReadOnly
+from .renderers import CSVRenderer, FastJSONRenderer, NDJSONRenderer
+from .routers import ReplicaReadMixin
 from .serializers import (CategorySerializer, CommentSerializer,
                           EditSelfProfileSerializer, GenreSerializer,
-                          RegistrationSerializer, ReviewSerializer,
-                          TitleSerializer, TitleShowSerializer,
-                          TokenSerializer, UserSerializer)
+                          LeaderboardEntrySerializer, RegistrationSerializer,
+                          ReviewBatchSerializer, ReviewSerializer,
+                          TitleBatchSerializer, TitleSerializer,
+                          TitleShowSerializer, TokenSerializer, UserSerializer)
+from .sparse import SparseFieldsViewMixin, SparseSerializerViewMixin
 
 
 class CategoriesViewSet(
-    mixins.CreateModelMixin, mixins.DestroyModelMixin,
-    GenericViewSet, mixins.ListModelMixin
+    ReplicaReadMixin, CachedResponseMixin, SparseFieldsViewMixin,
+    mixins.CreateModelMixin,
+    mixins.DestroyModelMixin, GenericViewSet, mixins.ListModelMixin
 ):
+    cache_resource = CATEGORIES
     permission_classes = (AllowAny, IsAdminOrReadOnly)
     queryset = Category.objects.all().order_by('name')
     serializer_class = CategorySerializer
@@ -35,9 +53,11 @@ class CategoriesViewSet(
 
 
 class GenresViewSet(
-    mixins.CreateModelMixin, mixins.DestroyModelMixin,
-    GenericViewSet, mixins.ListModelMixin
+    ReplicaReadMixin, CachedResponseMixin, SparseFieldsViewMixin,
+    mixins.CreateModelMixin,
+    mixins.DestroyModelMixin, GenericViewSet, mixins.ListModelMixin
 ):
+    cache_resource = GENRES
     permission_classes = (AllowAny, IsAdminOrReadOnly)
     queryset = Genre.objects.all().order_by('name')
     serializer_class = GenreSerializer
@@ -47,15 +67,21 @@ class GenresViewSet(
     ordering_fields = ('name',)
 
 
-class TitlesViewSet(viewsets.ModelViewSet):
+class TitlesViewSet(
+    ReplicaReadMixin, CachedResponseMixin, FastListMixin,
+    SparseFieldsViewMixin, viewsets.ModelViewSet
+):
+    cache_resource = TITLES
     permission_classes = (AllowAny, IsAdminOrReadOnly)
     queryset = (Title.objects.all()
-                .annotate(rating=Avg('reviews__score')).order_by('-id'))
-    filter_backends = (DjangoFilterBackend, filters.SearchFilter,
-                       filters.OrderingFilter)
+                .order_by('-id'))
+    filter_backends = (DjangoFilterBackend, filters.OrderingFilter,
+                       TitleSearchFilter)
     filterset_class = TitleFilter
-    search_fields = ('name', 'year', 'category', 'genre')
-    ordering_fields = ('name', 'year',)
+    ordering_fields = ('name', 'year', 'rating')
+    ordering = ('-id',)
+    select_related_fields = ('category',)
+    prefetch_related_fields = ('genre',)
 
     def get_serializer_class(self):
         if self.action in ['create', 'partial_update']:
@@ -63,32 +89,169 @@ class TitlesViewSet(viewsets.ModelViewSet):
         else:
             return TitleShowSerializer
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action == 'retrieve':
+            context['expand'] = self.get_expand()
+        return context
+
+    def get_expand(self):
+        """Разделы ?expand=reviews,... для карточки произведения."""
+        expand = {
+            name for name in
+            self.request.query_params.get('expand', '').split(',') if name
+        }
+        unknown = expand - set(TitleShowSerializer.expandable)
+        if unknown:
+            raise ValidationError({'expand': [
+                f'Неизвестный раздел: {name}' for name in sorted(unknown)
+            ]})
+        return expand
+
+    @action(methods=['post'], detail=False, url_path='batch')
+    def batch(self, request):
+        """Создаёт список произведений одной транзакцией."""
+        serializer = TitleBatchSerializer(
+            data=request.data, many=True, context={'request': request}
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            titles = serializer.save()
+            bump_generation(TITLES)
+        created = (Title.objects.filter(pk__in=[title.pk for title in titles])
+                   .select_related('category').prefetch_related('genre')
+                   .order_by('id'))
+        return Response(
+            TitleSerializer(created, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+class LeaderboardViewSet(
+    ReplicaReadMixin, CachedResponseMixin, SparseSerializerViewMixin,
+    mixins.ListModelMixin, GenericViewSet
+):
+    """
+    Лидерборд из URL по всем произведениям, жанру ?genre=<slug> или
+    категории ?category=<slug>; ?limit= ограничивает число мест.
+    Места пересчитывает команда update_leaderboards.
+    """
+    cache_resource = LEADERBOARDS
+    permission_classes = (AllowAny,)
+    serializer_class = LeaderboardEntrySerializer
+    pagination_class = None
+
+    def get_queryset(self):
+        return LeaderboardEntry.objects.filter(
+            board=self.kwargs['board'], scope=self.get_scope()
+        ).select_related('title').order_by('position')[:self.get_limit()]
+
+    def get_scope(self):
+        genre = self.request.query_params.get('genre')
+        category = self.request.query_params.get('category')
+        if genre and category:
+            raise ValidationError(
+                'Укажите либо genre, либо category, но не оба.'
+            )
+        if genre:
+            return genre_scope(genre)
+        if category:
+            return category_scope(category)
+        return ALL
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    def get_limit(self):
+        limit = self.request.query_params.get('limit')
+        if limit is None:
+            return settings.LEADERBOARD_SIZE
+        if not limit.isdigit() or not (
+            1 <= int(limit) <= settings.LEADERBOARD_SIZE
+        ):
+            raise ValidationError({'limit': [
+                f'Число от 1 до {settings.LEADERBOARD_SIZE}.'
+            ]})
+        return int(limit)
+
+
+class NestedListMixin:
+    """
+    Список вложенного ресурса. Родитель и число его объектов читаются
+    одним запросом get_object_count: он же даёт 404 для несуществующего
+    родителя, а пустая страница обходится без запроса самих объектов.
+
+    Вьюсет определяет get_object_count(): число объектов родителя или
+    None, если родителя нет. Число считается точным: отзывы берут его
+    из Title.reviews_count, поэтому запись отзывов в обход
+    update_rating() (сигналов Review) ломает пагинацию до запуска
+    update_ratings.
+    """
+
+    def list(self, request, *args, **kwargs):
+        count = self.get_object_count()
+        if count is None:
+            raise Http404
+        if self.paginator is not None:
+            self.paginator.object_count = count
+        return super().list(request, *args, **kwargs)
+
+
+class ReviewViewSet(
+    ReplicaReadMixin, NestedListMixin, FastListMixin, SparseFieldsViewMixin,
+    viewsets.ModelViewSet
+):
     """Вьюсет модели Review."""
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticatedOrReadOnly,
                           IsAuthorOrHigherOrReadOnly]
+    ordering = ('-pub_date', '-id')
+    select_related_fields = ('author',)
 
     def get_queryset(self):
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        return title.reviews.all()
+        return Review.objects.filter(title_id=self.kwargs.get('title_id'))
 
+    def get_object_count(self):
+        return Title.objects.filter(
+            pk=self.kwargs.get('title_id')
+        ).values_list('reviews_count', flat=True).first()
+
+    @transaction.atomic
     def perform_create(self, serializer):
         title_id = self.kwargs.get('title_id')
         title = get_object_or_404(Title, id=title_id)
         serializer.save(author=self.request.user, title=title)
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
 
-class CommentViewSet(viewsets.ModelViewSet):
+
+class CommentViewSet(
+    ReplicaReadMixin, NestedListMixin, FastListMixin, SparseFieldsViewMixin,
+    viewsets.ModelViewSet
+):
     """Вьюсет модели Comment."""
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticatedOrReadOnly,
                           IsAuthorOrHigherOrReadOnly]
+    ordering = ('-pub_date', '-id')
+    select_related_fields = ('author',)
 
     def get_queryset(self):
-        review = get_object_or_404(Review, pk=self.kwargs.get('review_id'))
-        return review.comments.all()
+        return Comment.objects.filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id'),
+        )
+
+    def get_object_count(self):
+        return Review.objects.filter(
+            pk=self.kwargs.get('review_id'),
+            title_id=self.kwargs.get('title_id'),
+        ).annotate(
+            comments_count=Count('comments')
+        ).values_list('comments_count', flat=True).first()
 
     def perform_create(self, serializer):
         title_id = self.kwargs.get('title_id')
@@ -97,18 +260,34 @@ class CommentViewSet(viewsets.ModelViewSet):
         serializer.save(author=self.request.user, review=review)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def reviews_batch(request):
+    """Вью-функция для пакетного создания отзывов текущего пользователя."""
+    serializer = ReviewBatchSerializer(
+        data=request.data, many=True, context={'request': request}
+    )
+    serializer.is_valid(raise_exception=True)
+    with transaction.atomic():
+        reviews = serializer.save()
+        bump_generation(TITLES)
+    return Response(
+        ReviewSerializer(reviews, many=True).data,
+        status=status.HTTP_201_CREATED
+    )
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def register(request):
     """Вью-функция для получения письма с кодом подтверждения."""
     serializer = RegistrationSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
-    user, _ = User.objects.get_or_create(**serializer.data)
+    user = serializer.save()
     confirmation_code = default_token_generator.make_token(user)
-    send_mail(
+    OutgoingEmail.enqueue(
         subject='Confirmation code for registration in YaMDb',
         message=f'Your confirmation code: {confirmation_code}',
-        from_email=None,
         recipient_list=[
             user.email,
         ]
@@ -134,7 +313,7 @@ def get_token(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     """Вьюсет модели User."""
     http_method_names = ['delete', 'get', 'post', 'patch']
     lookup_field = 'username'
@@ -156,7 +335,9 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer_class=EditSelfProfileSerializer,
     )
     def users_own_profile(self, request):
-        user = request.user
+        # request.user может прийти из кэша аутентификации, профиль
+        # читаем и меняем по актуальной строке из базы.
+        user = get_object_or_404(User, pk=request.user.pk)
         if request.method == 'GET':
             serializer = self.get_serializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -170,3 +351,57 @@ class UserViewSet(viewsets.ModelViewSet):
             serializer.save()
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class ProfilingView(APIView):
+    """Последние профили запросов этого процесса, новые первыми."""
+    permission_classes = (IsAdmin,)
+
+    def get(self, request):
+        return Response(list(reversed(profiling.samples)))
+
+
+class ExportView(APIView):
+    """
+    Потоковая выгрузка для аналитики: /export/<reviews|comments|titles>/.
+    Формат — ?format=ndjson (по умолчанию) или ?format=csv,
+    ?since=<ISO-дата> оставляет записи новее указанной pub_date.
+    Ошибки отдаются в JSON, а не в формате выгрузки.
+    """
+    permission_classes = (IsAdmin,)
+    renderer_classes = (NDJSONRenderer, CSVRenderer)
+
+    def handle_exception(self, exc):
+        self.request.accepted_renderer = FastJSONRenderer()
+        self.request.accepted_media_type = FastJSONRenderer.media_type
+        return super().handle_exception(exc)
+
+    def get(self, request, resource):
+        if resource not in EXPORT_FIELDS:
+            raise NotFound(f'Неизвестный ресурс {resource}')
+        since = request.query_params.get('since')
+        if since is not None:
+            if resource == 'titles':
+                raise ValidationError(
+                    {'since': 'У произведений нет даты публикации.'}
+                )
+            try:
+                since = parse_datetime(since)
+            except ValueError:
+                since = None
+            if since is None:
+                raise ValidationError({'since': 'Ожидается дата ISO 8601.'})
+        rows = export_rows(resource, since)
+        renderer = request.accepted_renderer
+        if renderer.format == CSVRenderer.format:
+            content = stream_csv(resource, rows)
+        else:
+            content = stream_ndjson(rows)
+        response = StreamingHttpResponse(
+            content,
+            content_type=f'{renderer.media_type}; charset={renderer.charset}',
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{resource}.{renderer.format}"'
+        )
+        return response
@@ -37,6 +37,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',
+    'api.profiling.ProfilingMiddleware',
+    'api.routers.PrimaryPinMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -46,7 +49,8 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'api_yamdb.urls'
+# asgi.py подставляет api_yamdb.urls_asgi с асинхронными эндпоинтами.
+ROOT_URLCONF = os.getenv('ROOT_URLCONF', 'api_yamdb.urls')
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
 TEMPLATES = [
@@ -76,10 +80,86 @@ DATABASES = {
         'USER': os.getenv('POSTGRES_USER', 'yatube_user'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', 'xxxyyyzzz'),
         'HOST': os.getenv('DB_HOST', '127.0.0.1'),
-        'PORT': os.getenv('DB_PORT', '5432')
+        'PORT': os.getenv('DB_PORT', '5432'),
+        # Время жизни соединения в секундах: 0 — на каждый запрос новое,
+        # None — без ограничения.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        # Проверка переиспользуемого соединения в начале запроса (api.db).
+        'CONN_HEALTH_CHECKS': (
+            os.getenv('DB_CONN_HEALTH_CHECKS', 'true') == 'true'
+        ),
     }
 }
 
+# Реплики для чтения: DB_REPLICA_HOSTS — хосты через запятую, остальные
+# параметры как у default. GET-запросы к каталогу, отзывам и комментариям
+# читают с реплик (api.routers), пользователь после своей записи ещё
+# REPLICA_PIN_SECONDS читает с primary.
+DATABASE_REPLICAS = []
+
+for number, host in enumerate(
+    filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(',')), start=1
+):
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        'HOST': host.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{number}')
+
+DATABASE_ROUTERS = ['api.routers.ReplicaRouter']
+
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+
+# Режим пулера транзакций (pgbouncer с pool_mode=transaction): чтение
+# серверными курсорами идёт внутри транзакции (api.db.cursor_transaction).
+DB_POOLER = os.getenv('DB_POOLER', 'false') == 'true'
+
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'yamdb'),
+    }
+}
+
+RESPONSE_CACHE_ALIAS = 'default'
+
+# Поколения кэша ответов должны быть общими для всех процессов: в
+# LocMemCache у каждого воркера gunicorn свои, и запись сбросила бы кэш
+# только в своём воркере. Поэтому без общего бэкенда (CACHE_BACKEND)
+# кэш ответов по умолчанию выключен.
+RESPONSE_CACHE_ENABLED = os.getenv(
+    'RESPONSE_CACHE_ENABLED',
+    str(not CACHES['default']['BACKEND'].endswith('.LocMemCache')).lower(),
+) == 'true'
+
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', 300))
+
+USER_CACHE_ALIAS = 'default'
+
+USER_CACHE_TIMEOUT = int(os.getenv('USER_CACHE_TIMEOUT', 60))
+
+# Метрики Prometheus на /metrics (api.metrics).
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true') == 'true'
+
+# Профилирование запросов (api.profiling): Server-Timing, лог
+# api.profiling и буфер последних запросов для /api/v1/profiling/.
+REQUEST_PROFILING = os.getenv('REQUEST_PROFILING', 'false') == 'true'
+
+REQUEST_PROFILING_SAMPLE_RATE = float(
+    os.getenv('REQUEST_PROFILING_SAMPLE_RATE', 0.1)
+)
+
+REQUEST_PROFILING_BUFFER_SIZE = int(
+    os.getenv('REQUEST_PROFILING_BUFFER_SIZE', 200)
+)
+
+REQUEST_PROFILING_SLOW_QUERIES = 5
+
 # Authorization settings
 
 AUTH_USER_MODEL = 'reviews.User'
@@ -105,9 +185,13 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication'
+        'api.authentication.CachedJWTAuthentication'
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.PageNumberOrCursorPagination',
     'PAGE_SIZE': 5
 }
 
@@ -124,6 +208,24 @@ EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
 DEFAULT_FROM_EMAIL = 'admin@yamdb.com'
 
+# Очередь писем: попытки и базовая задержка повтора в секундах,
+# задержка удваивается с каждой неудачной попыткой.
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', 5))
+
+EMAIL_OUTBOX_RETRY_DELAY = int(os.getenv('EMAIL_OUTBOX_RETRY_DELAY', 60))
+
+# Сколько секунд забранное воркером письмо не берут другие воркеры:
+# после падения воркера посреди пачки оно вернётся в очередь.
+EMAIL_OUTBOX_LEASE = int(os.getenv('EMAIL_OUTBOX_LEASE', 600))
+
+# Лидерборды (команда update_leaderboards): мест в каждом, минимум
+# отзывов для top_rated и окно trending в днях.
+LEADERBOARD_SIZE = int(os.getenv('LEADERBOARD_SIZE', 100))
+
+LEADERBOARD_MIN_REVIEWS = int(os.getenv('LEADERBOARD_MIN_REVIEWS', 1))
+
+LEADERBOARD_TRENDING_DAYS = int(os.getenv('LEADERBOARD_TRENDING_DAYS', 7))
+
 # Internationalization
 
 LANGUAGE_CODE = 'en-us'
@@ -1,13 +1,19 @@
+from api.metrics import metrics_view
 from django.contrib import admin
 from django.urls import include, path
 from django.views.generic import TemplateView
 
-urlpatterns = [
+# Маршруты вне API, общие для WSGI и ASGI (urls_asgi.py).
+site_urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api/', include('api.urls')),
+    path('metrics', metrics_view, name='metrics'),
     path(
         'redoc/',
         TemplateView.as_view(template_name='redoc.html'),
         name='redoc'
     ),
 ]
+
+urlpatterns = [
+    path('api/', include('api.urls')),
+] + site_urlpatterns
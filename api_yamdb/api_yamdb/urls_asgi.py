@@ -0,0 +1,14 @@
+"""
+Маршруты для ASGI: читающие эндпоинты каталога, отзывов и комментариев
+обслуживаются асинхронными представлениями (api.async_views),
+остальное — так же, как под WSGI, кроме выгрузки /api/v1/export/:
+она работает только под WSGI (см. api.urls).
+"""
+from api.urls import asgi_urlpatterns
+from django.urls import include, path
+
+from .urls import site_urlpatterns
+
+urlpatterns = [
+    path('api/', include(asgi_urlpatterns)),
+] + site_urlpatterns
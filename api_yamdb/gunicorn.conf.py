@@ -0,0 +1,82 @@
+"""
+Настройки gunicorn. Все параметры можно переопределить переменными
+окружения GUNICORN_* или ключами командной строки.
+
+Классы воркеров (GUNICORN_WORKER_CLASS):
+    gthread — по умолчанию: процессы с пулом потоков, медленный запрос
+        занимает поток, а не процесс;
+    gevent — зелёные потоки, нужны пакеты gevent и psycogreen; каждый
+        гринлет держит своё соединение, поэтому ставьте DB_CONN_MAX_AGE=0;
+    sync — один запрос на процесс;
+    uvicorn.workers.UvicornWorker — ASGI, вместе с api_yamdb.asgi.
+"""
+import multiprocessing
+import os
+import shutil
+
+from prometheus_client import multiprocess
+
+bind = os.getenv('GUNICORN_BIND', '0:8000')
+
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+
+# Запросы к API упираются в базу, а не в процессор: 2 процесса на ядро
+# плюс один, потоки внутри процесса покрывают ожидание ответа базы.
+workers = int(os.getenv(
+    'GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1
+))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 100))
+
+# Приложение загружается в мастере до fork: импортированный код и данные
+# делятся между воркерами копированием при записи.
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true') == 'true'
+
+# Перезапуск воркера после max_requests запросов ограничивает рост памяти,
+# разброс не даёт всем воркерам перезапуститься одновременно.
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# Самые долгие ответы — потоковые выгрузки /api/v1/export/. Воркеры
+# gthread и gevent шлют heartbeat из основного цикла, поэтому timeout
+# ограничивает зависание процесса, а не длину ответа; для sync он
+# должен покрывать самый медленный запрос.
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+# nginx держит keep-alive соединения с upstream (infra/nginx/default.conf).
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 75))
+
+# Heartbeat-файлы воркеров в памяти, а не на диске контейнера.
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+# Каталог, в котором воркеры хранят метрики (см. api/metrics.py). Он
+# должен существовать до загрузки приложения при preload_app.
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus')
+os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+
+def on_starting(server):
+    """Удаляет метрики прошлого запуска и значения мастера."""
+    directory = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+
+
+def post_fork(server, worker):
+    if server.cfg.worker_class_str == 'gevent':
+        from psycogreen.gevent import patch_psycopg
+
+        patch_psycopg()
+    if server.cfg.preload_app:
+        from api.metrics import WORKERS
+        from django.db import connections
+
+        # Соединения, открытые мастером при загрузке, не делятся
+        # между процессами.
+        connections.close_all()
+        WORKERS.set(1)
+
+
+def child_exit(server, worker):
+    multiprocess.mark_process_dead(worker.pid)
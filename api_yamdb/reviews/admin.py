@@ -1,8 +1,11 @@
 from django.contrib import admin
 from import_export import resources
 from import_export.admin import ImportExportModelAdmin
+from import_export.fields import Field
+from import_export.widgets import ForeignKeyWidget
 
-from .models import Category, Comment, Genre, GenreTitle, Review, Title, User
+from .models import (Category, Comment, Genre, GenreTitle, OutgoingEmail,
+                     Review, Title, User)
 
 
 class CategoryResource(resources.ModelResource):
@@ -65,12 +68,24 @@ class TitleAdmin(ImportExportModelAdmin):
 
 
 class GenreTitleResource(resources.ModelResource):
+    # Заголовки staticfiles/data/genre_title.csv: id,title_id,genre_id.
+    title = Field(
+        attribute='title',
+        column_name='title_id',
+        widget=ForeignKeyWidget(Title),
+    )
+    genre = Field(
+        attribute='genre',
+        column_name='genre_id',
+        widget=ForeignKeyWidget(Genre),
+    )
+
     class Meta:
         model = GenreTitle
         fields = (
             'id',
-            'title_id',
-            'genre_id',
+            'title',
+            'genre',
         )
 
 
@@ -78,9 +93,10 @@ class GenreTitleResource(resources.ModelResource):
 class GenreTitleAdmin(ImportExportModelAdmin):
     resource_classes = [GenreTitleResource]
     list_display = (
-        'genre_id',
-        'title_id',
+        'genre',
+        'title',
     )
+    list_select_related = ('genre', 'title')
 
 
 class ReviewResource(resources.ModelResource):
@@ -151,3 +167,15 @@ class UserAdmin(ImportExportModelAdmin):
         'email',
         'role',
     )
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient',
+        'subject',
+        'created',
+        'attempts',
+        'sent_at',
+    )
+    list_filter = ('sent_at',)
@@ -0,0 +1,177 @@
+"""
+Лидерборды произведений: top_rated, most_reviewed и trending в разделах
+all, genre:<slug> и category:<slug>.
+
+Места хранятся в LeaderboardEntry, чтение лидерборда — один проход по
+уникальному индексу (board, scope, position). Запись отзыва отмечает
+произведение флагом leaderboards_stale (Title.objects.update_rating),
+и refresh_leaderboards пересчитывает top_rated и most_reviewed только
+в разделах отмеченных произведений. trending зависит от времени, а не
+только от записей, и пересчитывается целиком: окно берёт лишь отзывы
+последних LEADERBOARD_TRENDING_DAYS дней.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import (Category, Genre, GenreTitle, LeaderboardEntry, Review,
+                     Title)
+
+ALL = 'all'
+
+# Больше отмеченных произведений — дешевле пересчитать всё.
+MAX_INCREMENTAL_TITLES = 1000
+
+
+def genre_scope(slug):
+    return f'genre:{slug}'
+
+
+def category_scope(slug):
+    return f'category:{slug}'
+
+
+def scope_titles(scope):
+    """Произведения раздела."""
+    if scope == ALL:
+        return Title.objects.all()
+    kind, slug = scope.split(':', 1)
+    if kind == 'genre':
+        return Title.objects.filter(genre__slug=slug)
+    return Title.objects.filter(category__slug=slug)
+
+
+def all_scopes():
+    return [ALL] + [
+        genre_scope(slug)
+        for slug in Genre.objects.values_list('slug', flat=True)
+    ] + [
+        category_scope(slug)
+        for slug in Category.objects.values_list('slug', flat=True)
+    ]
+
+
+def title_scopes(title_ids):
+    """Разделы, в которых произведения есть сейчас или были в лидерборде."""
+    scopes = {ALL}
+    scopes.update(
+        genre_scope(slug) for slug in GenreTitle.objects.filter(
+            title_id__in=title_ids
+        ).values_list('genre__slug', flat=True).distinct()
+    )
+    scopes.update(
+        category_scope(slug) for slug in Title.objects.filter(
+            pk__in=title_ids, category__isnull=False
+        ).values_list('category__slug', flat=True).distinct()
+    )
+    scopes.update(LeaderboardEntry.objects.filter(
+        title_id__in=title_ids
+    ).values_list('scope', flat=True).distinct())
+    return scopes
+
+
+def ranking(board, scope):
+    """Пары (id произведения, значение) лучших мест раздела."""
+    titles = scope_titles(scope)
+    if board == LeaderboardEntry.TOP_RATED:
+        titles = titles.filter(
+            rating__isnull=False,
+            reviews_count__gte=settings.LEADERBOARD_MIN_REVIEWS,
+        ).order_by('-rating', '-reviews_count', '-id')
+        value = 'rating'
+    else:
+        titles = titles.filter(
+            reviews_count__gt=0
+        ).order_by('-reviews_count', '-rating', '-id')
+        value = 'reviews_count'
+    return titles.values_list('id', value)[:settings.LEADERBOARD_SIZE]
+
+
+def trending_rankings():
+    """
+    Места trending во всех разделах: число отзывов за окно по
+    произведениям, затем разделы этих произведений — три запроса.
+    """
+    since = timezone.now() - timedelta(
+        days=settings.LEADERBOARD_TRENDING_DAYS
+    )
+    counts = dict(
+        Review.objects.filter(pub_date__gte=since).order_by()
+        .values('title').annotate(value=Count('id'))
+        .values_list('title', 'value')
+    )
+    scopes = defaultdict(list)
+    scopes[ALL] = list(counts)
+    for title_id, slug in GenreTitle.objects.filter(
+        title_id__in=counts
+    ).values_list('title_id', 'genre__slug'):
+        scopes[genre_scope(slug)].append(title_id)
+    for title_id, slug in Title.objects.filter(
+        pk__in=counts, category__isnull=False
+    ).values_list('id', 'category__slug'):
+        scopes[category_scope(slug)].append(title_id)
+    return {
+        scope: [
+            (title_id, counts[title_id]) for title_id in sorted(
+                title_ids, key=lambda pk: (-counts[pk], -pk)
+            )[:settings.LEADERBOARD_SIZE]
+        ]
+        for scope, title_ids in scopes.items()
+    }
+
+
+def save_board(board, rankings, replace_all=False):
+    """Заменяет места лидерборда board в разделах rankings."""
+    entries = LeaderboardEntry.objects.filter(board=board)
+    if not replace_all:
+        entries = entries.filter(scope__in=rankings)
+    entries.delete()
+    LeaderboardEntry.objects.bulk_create([
+        LeaderboardEntry(
+            board=board, scope=scope, position=position,
+            title_id=title_id, value=value,
+        )
+        for scope, ranked in rankings.items()
+        for position, (title_id, value) in enumerate(ranked, start=1)
+    ])
+
+
+def refresh_leaderboards(full=False):
+    """
+    Пересчитывает лидерборды: с full — все разделы, иначе только
+    разделы отмеченных произведений. Флаги снимаются в одной транзакции
+    с пересчётом: при ошибке они остаются, а отзыв, записанный во время
+    пересчёта, отметит произведение снова и попадёт в следующий запуск
+    (его UPDATE ждёт конца транзакции). Возвращает число разделов
+    top_rated и most_reviewed, пересчитанных заново.
+    """
+    stale = Title.objects.filter(leaderboards_stale=True)
+    title_ids = []
+    if not full:
+        title_ids = list(
+            stale.values_list('id', flat=True)[:MAX_INCREMENTAL_TITLES + 1]
+        )
+        full = len(title_ids) > MAX_INCREMENTAL_TITLES
+    with transaction.atomic():
+        if full:
+            stale.update(leaderboards_stale=False)
+            scopes = all_scopes()
+        else:
+            Title.objects.filter(pk__in=title_ids).update(
+                leaderboards_stale=False
+            )
+            scopes = sorted(title_scopes(title_ids)) if title_ids else []
+        for board in (
+            LeaderboardEntry.TOP_RATED, LeaderboardEntry.MOST_REVIEWED
+        ):
+            save_board(board, {
+                scope: list(ranking(board, scope)) for scope in scopes
+            }, replace_all=full)
+        save_board(
+            LeaderboardEntry.TRENDING, trending_rankings(), replace_all=True
+        )
+    return len(scopes)
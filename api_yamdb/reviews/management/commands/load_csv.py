@@ -0,0 +1,297 @@
+import csv
+import io
+import os
+from contextlib import contextmanager
+from datetime import date, datetime
+from itertools import islice
+
+from api.cache import CATEGORIES, GENRES, TITLES, bump_generation
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, User)
+
+DEFAULT_PATH = os.path.join(settings.BASE_DIR, 'staticfiles', 'data')
+
+# Файлы в порядке зависимостей: сначала те, на кого ссылаются.
+SOURCES = (
+    ('users.csv', User),
+    ('category.csv', Category),
+    ('genre.csv', Genre),
+    ('titles.csv', Title),
+    ('genre_title.csv', GenreTitle),
+    ('review.csv', Review),
+    ('comments.csv', Comment),
+)
+
+MAX_REPORTED_ERRORS = 20
+
+
+def copy_value(value):
+    """Значение в текстовом формате COPY."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    return (
+        str(value).replace('\\', '\\\\').replace('\t', '\\t')
+        .replace('\n', '\\n').replace('\r', '\\r')
+    )
+
+
+@contextmanager
+def keep_auto_now_add(model):
+    """Не даёт bulk_create затереть даты из файла текущим временем."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает CSV-файлы каталога (users, category, genre, titles, '
+        'genre_title, review, comments) пачками с upsert по id.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=DEFAULT_PATH,
+            help='Каталог с CSV-файлами.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Количество строк в одной пачке.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только проверить файлы, ничего не записывая.',
+        )
+        parser.add_argument(
+            '--no-copy',
+            action='store_true',
+            help='Не использовать COPY даже на PostgreSQL.',
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.dry_run = options['dry_run']
+        self.use_copy = (
+            connection.vendor == 'postgresql' and not options['no_copy']
+        )
+        if self.dry_run:
+            # Внешние ключи проверяются по базе, поэтому пробная загрузка
+            # записывает файлы и откатывает транзакцию.
+            with transaction.atomic():
+                self.load_files(options['path'])
+                transaction.set_rollback(True)
+            self.stdout.write(self.style.SUCCESS('Файлы корректны'))
+            return
+        loaded = self.load_files(options['path'])
+        self.reset_sequences(loaded)
+        call_command('update_ratings', stdout=self.stdout)
+        bump_generation(CATEGORIES, GENRES, TITLES)
+        self.stdout.write(self.style.SUCCESS('Загрузка завершена'))
+
+    def load_files(self, directory):
+        """Загружает найденные файлы SOURCES, возвращает их модели."""
+        loaded = []
+        for filename, model in SOURCES:
+            path = os.path.join(directory, filename)
+            if not os.path.exists(path):
+                self.stdout.write(f'{filename}: нет файла, пропущен')
+                continue
+            self.load_file(path, filename, model)
+            loaded.append(model)
+        return loaded
+
+    def load_file(self, path, filename, model):
+        with open(path, encoding='utf-8', newline='') as file:
+            reader = csv.DictReader(file)
+            fields = self.get_fields(filename, model, reader.fieldnames)
+            rows = enumerate(reader, start=2)
+            total = 0
+            with transaction.atomic(), keep_auto_now_add(model):
+                while True:
+                    batch = list(islice(rows, self.batch_size))
+                    if not batch:
+                        break
+                    objects = self.build_objects(
+                        filename, model, fields, batch
+                    )
+                    self.save_objects(model, fields, objects)
+                    total += len(objects)
+                    self.stdout.write(f'{filename}: {total} строк')
+
+    def get_fields(self, filename, model, columns):
+        fields = {}
+        for column in columns or ():
+            try:
+                fields[column] = model._meta.get_field(column)
+            except FieldDoesNotExist:
+                raise CommandError(
+                    f'{filename}: неизвестная колонка {column}'
+                )
+        if 'id' not in fields:
+            raise CommandError(f'{filename}: нет колонки id')
+        return fields
+
+    def build_objects(self, filename, model, fields, batch):
+        errors = []
+        objects = []
+        for line, row in batch:
+            values = {}
+            for column, field in fields.items():
+                value = row[column]
+                if value == '' and field.null:
+                    value = None
+                try:
+                    values[field.attname] = (
+                        None if value is None
+                        else field.target_field.to_python(value)
+                        if field.is_relation else field.to_python(value)
+                    )
+                except ValidationError as error:
+                    errors.append(f'строка {line}, {column}: {error}')
+            instance = model(**values)
+            try:
+                instance.clean_fields(exclude=[
+                    field.name for field in model._meta.fields
+                    if field.is_relation or field.name not in fields
+                ])
+            except ValidationError as error:
+                errors.append(f'строка {line}: {error}')
+            objects.append((line, instance))
+        errors.extend(self.check_relations(model, fields, objects))
+        if errors:
+            raise CommandError(
+                f'{filename}: ошибки в данных\n'
+                + '\n'.join(errors[:MAX_REPORTED_ERRORS])
+            )
+        return [instance for _, instance in objects]
+
+    def check_relations(self, model, fields, objects):
+        """
+        Проверяет внешние ключи пачки одним запросом на связь. Файлы
+        загружаются в порядке зависимостей, поэтому всё, на что можно
+        сослаться, уже в базе.
+        """
+        for field in fields.values():
+            if not field.is_relation:
+                continue
+            related = field.related_model
+            wanted = {
+                getattr(instance, field.attname) for _, instance in objects
+            } - {None}
+            missing = wanted - set(
+                related.objects.filter(pk__in=wanted)
+                .values_list('pk', flat=True)
+            )
+            for line, instance in objects:
+                if getattr(instance, field.attname) in missing:
+                    yield (
+                        f'строка {line}: нет {related._meta.model_name} '
+                        f'с id={getattr(instance, field.attname)}'
+                    )
+
+    def save_objects(self, model, fields, objects):
+        if model is User:
+            password = make_password(None)
+            for user in objects:
+                user.password = password
+        update_fields = [
+            field.attname for name, field in fields.items() if name != 'id'
+        ]
+        # Связи без собственных данных: повтор пары пропускается.
+        is_through = model is GenreTitle
+        if self.use_copy:
+            self.copy_objects(model, update_fields, objects, is_through)
+            return
+        if is_through:
+            model.objects.bulk_create(objects, ignore_conflicts=True)
+            return
+        existing = set(
+            model.objects.filter(pk__in=[obj.pk for obj in objects])
+            .values_list('pk', flat=True)
+        )
+        model.objects.bulk_create(
+            [obj for obj in objects if obj.pk not in existing]
+        )
+        if existing and update_fields:
+            model.objects.bulk_update(
+                [obj for obj in objects if obj.pk in existing],
+                update_fields,
+            )
+
+    def copy_objects(self, model, update_fields, objects, is_through):
+        """COPY во временную таблицу и INSERT ... ON CONFLICT из неё."""
+        table = connection.ops.quote_name(model._meta.db_table)
+        pk = model._meta.pk.column
+        columns = [
+            field for field in model._meta.concrete_fields
+            if not isinstance(field, SearchVectorField)
+        ]
+        names = ', '.join(
+            connection.ops.quote_name(field.column) for field in columns
+        )
+        buffer = io.StringIO()
+        for obj in objects:
+            buffer.write('\t'.join(
+                copy_value(field.get_db_prep_save(
+                    getattr(obj, field.attname), connection
+                ))
+                for field in columns
+            ))
+            buffer.write('\n')
+        buffer.seek(0)
+        # У связи конфликтом может быть и id, и уникальная пара
+        # (title, genre): любой из них пропускает строку, как
+        # bulk_create(ignore_conflicts=True).
+        target = '' if is_through else f'({connection.ops.quote_name(pk)}) '
+        conflict = 'DO NOTHING'
+        if update_fields and not is_through:
+            conflict = 'DO UPDATE SET ' + ', '.join(
+                f'{column} = EXCLUDED.{column}' for column in (
+                    connection.ops.quote_name(
+                        model._meta.get_field(name).column
+                    ) for name in update_fields
+                )
+            )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TEMP TABLE load_csv_batch (LIKE {table})'
+            )
+            cursor.copy_expert(
+                f'COPY load_csv_batch ({names}) FROM STDIN', buffer
+            )
+            cursor.execute(
+                f'INSERT INTO {table} ({names}) '
+                f'SELECT {names} FROM load_csv_batch '
+                f'ON CONFLICT {target}{conflict}'
+            )
+            cursor.execute('DROP TABLE load_csv_batch')
+
+    def reset_sequences(self, loaded):
+        statements = connection.ops.sequence_reset_sql(no_style(), loaded)
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
@@ -0,0 +1,114 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from reviews.models import OutgoingEmail
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди пачками через одно соединение.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Сколько писем забирать из очереди за раз.',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Работать постоянно, опрашивая очередь.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза между опросами пустой очереди, секунды.',
+        )
+
+    def handle(self, *args, **options):
+        connection = get_connection()
+        try:
+            while True:
+                sent = self.send_batch(connection, options['batch_size'])
+                if sent:
+                    continue
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+                # Воркер живёт дольше соединения с базой: после
+                # перезапуска сервера оно открывается заново.
+                close_old_connections()
+        finally:
+            connection.close()
+
+    def claim_batch(self, batch_size):
+        """
+        Забирает пачку писем короткой транзакцией: строки блокируются с
+        SKIP LOCKED, попытка засчитывается сразу, а send_after
+        сдвигается на EMAIL_OUTBOX_LEASE. Так другие воркеры не возьмут
+        эти письма, пока идёт отправка, а после падения воркера письма
+        вернутся в очередь, когда аренда истечёт.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            emails = list(
+                OutgoingEmail.objects.select_for_update(skip_locked=True)
+                .filter(
+                    sent_at__isnull=True,
+                    send_after__lte=now,
+                    attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+                )[:batch_size]
+            )
+            for email in emails:
+                email.attempts += 1
+                email.send_after = now + timedelta(
+                    seconds=settings.EMAIL_OUTBOX_LEASE
+                )
+            OutgoingEmail.objects.bulk_update(
+                emails, ['attempts', 'send_after']
+            )
+        return emails
+
+    def send_batch(self, connection, batch_size):
+        """
+        Отправляет одну пачку вне транзакции, результат каждого письма
+        записывается сразу после отправки. Возвращает количество
+        обработанных писем.
+        """
+        emails = self.claim_batch(batch_size)
+        if not emails:
+            return 0
+        failed = 0
+        for email in emails:
+            try:
+                connection.send_messages([EmailMessage(
+                    subject=email.subject,
+                    body=email.body,
+                    to=[email.recipient],
+                    connection=connection,
+                )])
+            except Exception as error:
+                failed += 1
+                OutgoingEmail.objects.filter(pk=email.pk).update(
+                    last_error=repr(error),
+                    send_after=timezone.now() + timedelta(
+                        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY
+                        * 2 ** (email.attempts - 1)
+                    ),
+                )
+                # Соединение после ошибки может быть сломано.
+                connection.close()
+            else:
+                OutgoingEmail.objects.filter(pk=email.pk).update(
+                    sent_at=timezone.now(), last_error='',
+                )
+        self.stdout.write(
+            f'Отправлено писем: {len(emails) - failed}, ошибок: {failed}'
+        )
+        return len(emails)
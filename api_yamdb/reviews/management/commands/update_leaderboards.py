@@ -0,0 +1,48 @@
+import time
+
+from api.cache import LEADERBOARDS, bump_generation
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from reviews.leaderboards import refresh_leaderboards
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает лидерборды произведений: разделы с новыми отзывами '
+        'и trending целиком.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help=(
+                'Пересчитать все разделы, например после переименования '
+                'жанров и категорий.'
+            ),
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Работать постоянно, пересчитывая каждые --interval секунд.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=60,
+            help='Пауза между пересчётами, секунды.',
+        )
+
+    def handle(self, *args, **options):
+        full = options['full']
+        while True:
+            scopes = refresh_leaderboards(full=full)
+            bump_generation(LEADERBOARDS)
+            self.stdout.write(f'Пересчитано разделов: {scopes}')
+            if not options['loop']:
+                break
+            full = False
+            time.sleep(options['interval'])
+            # Воркер живёт дольше соединения с базой: после
+            # перезапуска сервера оно открывается заново.
+            close_old_connections()
@@ -0,0 +1,66 @@
+from api.db import cursor_transaction
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рейтинг, количество отзывов и оценок произведений.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только сверить сохранённые значения, ничего не меняя.',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            self.check_ratings()
+        else:
+            self.rebuild_ratings()
+
+    def rebuild_ratings(self):
+        with transaction.atomic():
+            updated = Title.objects.update_rating()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитан рейтинг {updated} произведений')
+        )
+
+    def check_ratings(self):
+        actual = Title.objects.rating_values()
+        fields = list(actual)
+        titles = Title.objects.annotate(**{
+            f'actual_{field}': value for field, value in actual.items()
+        }).values(
+            'id', *fields, *(f'actual_{field}' for field in fields)
+        ).order_by('id')
+        broken = 0
+        with cursor_transaction():
+            for title in titles.iterator():
+                wrong = [
+                    f'{field} {title[field]} (должно быть '
+                    f'{title[f"actual_{field}"]})'
+                    for field in fields
+                    if not self.same(title[field], title[f'actual_{field}'])
+                ]
+                if not wrong:
+                    continue
+                broken += 1
+                self.stdout.write(
+                    f'Произведение {title["id"]}: ' + ', '.join(wrong)
+                )
+        if broken:
+            raise CommandError(
+                f'Рассинхронизировано произведений: {broken}. '
+                f'Запустите update_ratings без --check.'
+            )
+        self.stdout.write(self.style.SUCCESS('Рейтинги в порядке'))
+
+    @staticmethod
+    def same(stored, actual):
+        return stored == actual or (
+            None not in (stored, actual) and abs(stored - actual) < 1e-9
+        )
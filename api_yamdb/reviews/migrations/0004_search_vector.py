@@ -0,0 +1,146 @@
+# Generated by Django 3.2.16 on 2026-10-17 05:50
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# SQL поиска зафиксирован в миграции: правки reviews/search.py не
+# меняют историю. Миграции, пересоздающие на SQLite reviews_title или
+# reviews_review, повторяют install_search той версии, что действует
+# на их момент.
+SEARCH_CONFIG = 'russian'
+
+POSTGRESQL_INSTALL = (
+    f"""
+    CREATE OR REPLACE FUNCTION reviews_title_search_vector_update()
+    RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('{SEARCH_CONFIG}',
+                                  coalesce(NEW.name, '')), 'A')
+            || setweight(to_tsvector('{SEARCH_CONFIG}',
+                                     coalesce(NEW.description, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    DROP TRIGGER IF EXISTS reviews_title_search_vector_trigger
+    ON reviews_title;
+    """,
+    """
+    CREATE TRIGGER reviews_title_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON reviews_title
+    FOR EACH ROW EXECUTE PROCEDURE reviews_title_search_vector_update();
+    """,
+    """
+    DROP TRIGGER IF EXISTS reviews_review_search_vector_trigger
+    ON reviews_review;
+    """,
+    f"""
+    CREATE TRIGGER reviews_review_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON reviews_review
+    FOR EACH ROW EXECUTE PROCEDURE tsvector_update_trigger(
+        search_vector, 'pg_catalog.{SEARCH_CONFIG}', text
+    );
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS reviews_title_search_vector_idx
+    ON reviews_title USING gin (search_vector);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS reviews_review_search_vector_idx
+    ON reviews_review USING gin (search_vector);
+    """,
+    'UPDATE reviews_title SET name = name;',
+    'UPDATE reviews_review SET text = text;',
+)
+
+POSTGRESQL_UNINSTALL = (
+    'DROP TRIGGER IF EXISTS reviews_title_search_vector_trigger '
+    'ON reviews_title;',
+    'DROP TRIGGER IF EXISTS reviews_review_search_vector_trigger '
+    'ON reviews_review;',
+    'DROP FUNCTION IF EXISTS reviews_title_search_vector_update();',
+    'DROP INDEX IF EXISTS reviews_title_search_vector_idx;',
+    'DROP INDEX IF EXISTS reviews_review_search_vector_idx;',
+)
+
+
+def sqlite_fts_statements(table, columns):
+    """SQL для FTS5-таблицы, синхронизируемой с table триггерами."""
+    fts = f'{table}_fts'
+    names = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    delete = (
+        f"INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    insert = (
+        f'INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});'
+    )
+    return (
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5('
+        f"{names}, content='{table}', content_rowid='id');",
+        f'DROP TRIGGER IF EXISTS {fts}_insert;',
+        f'DROP TRIGGER IF EXISTS {fts}_delete;',
+        f'DROP TRIGGER IF EXISTS {fts}_update;',
+        f'CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} '
+        f'BEGIN {insert} END;',
+        f'CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} '
+        f'BEGIN {delete} END;',
+        f'CREATE TRIGGER {fts}_update AFTER UPDATE ON {table} '
+        f'BEGIN {delete} {insert} END;',
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild');",
+    )
+
+
+SQLITE_INSTALL = (
+    sqlite_fts_statements('reviews_title', ('name', 'description'))
+    + sqlite_fts_statements('reviews_review', ('text',))
+)
+
+SQLITE_UNINSTALL = (
+    'DROP TABLE IF EXISTS reviews_title_fts;',
+    'DROP TABLE IF EXISTS reviews_review_fts;',
+)
+
+
+def install_search(apps, schema_editor):
+    """Создаёт триггеры и индексы поиска."""
+    statements = {
+        'postgresql': POSTGRESQL_INSTALL,
+        'sqlite': SQLITE_INSTALL,
+    }.get(schema_editor.connection.vendor, ())
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def uninstall_search(apps, schema_editor):
+    statements = {
+        'postgresql': POSTGRESQL_UNINSTALL,
+        'sqlite': SQLITE_UNINSTALL,
+    }.get(schema_editor.connection.vendor, ())
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_pub_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(install_search, uninstall_search),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 3.2.16 on 2026-10-17 06:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def quoted_tables(apps, schema_editor):
+    quote = schema_editor.quote_name
+    old = apps.get_model('reviews', 'GenreTitle')._meta.db_table
+    through = apps.get_model('reviews', 'Title').genre.through
+    return quote(old), quote(through._meta.db_table)
+
+
+def merge_genre_titles(apps, schema_editor):
+    """Переносит связи из reviews_genretitle в таблицу Title.genre."""
+    old, through = quoted_tables(apps, schema_editor)
+    schema_editor.execute(
+        f'INSERT INTO {through} (title_id, genre_id) '
+        f'SELECT DISTINCT old.title_id, old.genre_id FROM {old} old '
+        f'WHERE NOT EXISTS (SELECT 1 FROM {through} link '
+        f'WHERE link.title_id = old.title_id '
+        f'AND link.genre_id = old.genre_id)'
+    )
+
+
+def split_genre_titles(apps, schema_editor):
+    old, through = quoted_tables(apps, schema_editor)
+    schema_editor.execute(
+        f'INSERT INTO {old} (title_id, genre_id) '
+        f'SELECT title_id, genre_id FROM {through}'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_outgoing_email'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_genre_titles, split_genre_titles),
+        migrations.DeleteModel(
+            name='GenreTitle',
+        ),
+        # Таблица reviews_title_genre остаётся: меняется только описание.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='GenreTitle',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='reviews.title')),
+                        ('genre', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='reviews.genre')),
+                    ],
+                    options={
+                        'db_table': 'reviews_title_genre',
+                        'unique_together': {('title', 'genre')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='title',
+                    name='genre',
+                    field=models.ManyToManyField(related_name='titles', through='reviews.GenreTitle', to='reviews.Genre', verbose_name='категория'),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='genretitle',
+            index=models.Index(fields=['genre', 'title'], name='genre_title_genre_idx'),
+        ),
+        migrations.AlterField(
+            model_name='genretitle',
+            name='genre',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='reviews.genre'),
+        ),
+        migrations.AlterField(
+            model_name='genretitle',
+            name='title',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='reviews.title'),
+        ),
+    ]
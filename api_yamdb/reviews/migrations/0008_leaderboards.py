@@ -0,0 +1,54 @@
+# Generated by Django 3.2.16 on 2026-10-17 06:24
+
+from importlib import import_module
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+install_search = import_module(
+    'reviews.migrations.0004_search_vector'
+).install_search
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_title_score_counts'),
+    ]
+
+    # Добавление поля пересоздаёт reviews_title на SQLite, см. 0007.
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, install_search),
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(choices=[('top_rated', 'Лучшие по оценке'), ('most_reviewed', 'Больше всего отзывов'), ('trending', 'Популярные сейчас')], max_length=20, verbose_name='Лидерборд')),
+                ('scope', models.CharField(max_length=60, verbose_name='Раздел')),
+                ('position', models.PositiveSmallIntegerField(verbose_name='Место')),
+                ('value', models.FloatField(verbose_name='Значение')),
+            ],
+            options={
+                'ordering': ('board', 'scope', 'position'),
+            },
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='leaderboards_stale',
+            field=models.BooleanField(default=True, editable=False, verbose_name='Пересчитать лидерборды'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(condition=models.Q(('leaderboards_stale', True)), fields=['id'], name='title_leaderboards_stale_idx'),
+        ),
+        migrations.AddField(
+            model_name='leaderboardentry',
+            name='title',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reviews.title', verbose_name='Произведение'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(fields=('board', 'scope', 'position'), name='leaderboard_position_unique'),
+        ),
+        migrations.RunPython(install_search, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 3.2.16 on 2026-10-17 09:10
+
+from django.db import migrations
+
+# Триггеры поиска срабатывают только на изменение текстовых колонок:
+# обновления рейтинга, счётчиков оценок и флагов лидербордов больше не
+# пересчитывают tsvector и строки FTS.
+POSTGRESQL_TRIGGERS = (
+    'DROP TRIGGER IF EXISTS reviews_title_search_vector_trigger '
+    'ON reviews_title;',
+    """
+    CREATE TRIGGER reviews_title_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, description ON reviews_title
+    FOR EACH ROW EXECUTE PROCEDURE reviews_title_search_vector_update();
+    """,
+    'DROP TRIGGER IF EXISTS reviews_review_search_vector_trigger '
+    'ON reviews_review;',
+    """
+    CREATE TRIGGER reviews_review_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF text ON reviews_review
+    FOR EACH ROW EXECUTE PROCEDURE tsvector_update_trigger(
+        search_vector, 'pg_catalog.russian', text
+    );
+    """,
+)
+
+POSTGRESQL_TRIGGERS_REVERSE = (
+    'DROP TRIGGER IF EXISTS reviews_title_search_vector_trigger '
+    'ON reviews_title;',
+    """
+    CREATE TRIGGER reviews_title_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON reviews_title
+    FOR EACH ROW EXECUTE PROCEDURE reviews_title_search_vector_update();
+    """,
+    'DROP TRIGGER IF EXISTS reviews_review_search_vector_trigger '
+    'ON reviews_review;',
+    """
+    CREATE TRIGGER reviews_review_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON reviews_review
+    FOR EACH ROW EXECUTE PROCEDURE tsvector_update_trigger(
+        search_vector, 'pg_catalog.russian', text
+    );
+    """,
+)
+
+
+def sqlite_update_trigger(table, columns, only_changed):
+    fts = f'{table}_fts'
+    names = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    event = f'UPDATE ON {table}'
+    if only_changed:
+        changed = ' OR '.join(
+            f'old.{column} IS NOT new.{column}' for column in columns
+        )
+        event = f'UPDATE OF {names} ON {table} WHEN {changed}'
+    return (
+        f'DROP TRIGGER IF EXISTS {fts}_update;',
+        f'CREATE TRIGGER {fts}_update AFTER {event} BEGIN '
+        f"INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old_values}); "
+        f'INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); '
+        'END;',
+    )
+
+
+def sqlite_triggers(only_changed):
+    return (
+        sqlite_update_trigger(
+            'reviews_title', ('name', 'description'), only_changed
+        )
+        + sqlite_update_trigger('reviews_review', ('text',), only_changed)
+    )
+
+
+def run(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement)
+
+
+def restrict_triggers(apps, schema_editor):
+    run(schema_editor, {
+        'postgresql': POSTGRESQL_TRIGGERS,
+        'sqlite': sqlite_triggers(only_changed=True),
+    })
+
+
+def widen_triggers(apps, schema_editor):
+    run(schema_editor, {
+        'postgresql': POSTGRESQL_TRIGGERS_REVERSE,
+        'sqlite': sqlite_triggers(only_changed=False),
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_leaderboards'),
+    ]
+
+    operations = [
+        migrations.RunPython(restrict_triggers, widen_triggers),
+    ]
@@ -1,7 +1,20 @@
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+
+MIN_SCORE = 1
+MAX_SCORE = 10
+SCORES = range(MIN_SCORE, MAX_SCORE + 1)
+RATING_BATCH_SIZE = 1000
+
+
+def score_field(score):
+    """Имя поля Title с количеством оценок score."""
+    return f'score_{score}'
 
 
 class User(AbstractUser):
@@ -86,6 +99,58 @@ class Genre(models.Model):
         return self.name
 
 
+class TitleQuerySet(models.QuerySet):
+
+    @staticmethod
+    def rating_values():
+        """
+        Агрегаты фактических рейтинга, количества отзывов и количества
+        каждой оценки: один LEFT JOIN с отзывами и GROUP BY произведения.
+        """
+        return {
+            'rating': Avg('reviews__score'),
+            'reviews_count': Count('reviews'),
+            **{
+                score_field(score): Count(
+                    'reviews', filter=Q(reviews__score=score)
+                )
+                for score in SCORES
+            },
+        }
+
+    def actual_ratings(self):
+        """
+        Словари {'id': ..., поле: фактическое значение} для полей
+        rating_values(). Аннотации не могут называться как поля модели,
+        поэтому в запросе у них префикс actual_.
+        """
+        values = self.rating_values()
+        rows = self.order_by().annotate(**{
+            f'actual_{field}': value for field, value in values.items()
+        }).values('id', *(f'actual_{field}' for field in values))
+        for row in rows:
+            yield {'id': row['id'], **{
+                field: row[f'actual_{field}'] for field in values
+            }}
+
+    def update_rating(self):
+        """
+        Пересчитывает рейтинг и счётчики оценок выбранных произведений:
+        один запрос агрегатов и bulk_update по RATING_BATCH_SIZE
+        произведений. Произведения отмечаются для пересчёта
+        рейтингов-лидербордов.
+        """
+        titles = [
+            self.model(leaderboards_stale=True, **row)
+            for row in self.actual_ratings()
+        ]
+        self.model.objects.bulk_update(
+            titles, [*self.rating_values(), 'leaderboards_stale'],
+            batch_size=RATING_BATCH_SIZE,
+        )
+        return len(titles)
+
+
 class Title(models.Model):
     name = models.CharField(max_length=256,
                             verbose_name='название произведения')
@@ -105,28 +170,173 @@ class Title(models.Model):
     )
     genre = models.ManyToManyField(
         Genre,
+        through='GenreTitle',
         related_name='titles',
         verbose_name='категория',
     )
+    rating = models.FloatField(
+        verbose_name='Рейтинг',
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+    )
+    reviews_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0,
+        editable=False,
+    )
+    # Гистограмма оценок: score_field(score) для score из SCORES.
+    score_1 = models.PositiveIntegerField(
+        verbose_name='Оценок 1',
+        default=0,
+        editable=False,
+    )
+    score_2 = models.PositiveIntegerField(
+        verbose_name='Оценок 2',
+        default=0,
+        editable=False,
+    )
+    score_3 = models.PositiveIntegerField(
+        verbose_name='Оценок 3',
+        default=0,
+        editable=False,
+    )
+    score_4 = models.PositiveIntegerField(
+        verbose_name='Оценок 4',
+        default=0,
+        editable=False,
+    )
+    score_5 = models.PositiveIntegerField(
+        verbose_name='Оценок 5',
+        default=0,
+        editable=False,
+    )
+    score_6 = models.PositiveIntegerField(
+        verbose_name='Оценок 6',
+        default=0,
+        editable=False,
+    )
+    score_7 = models.PositiveIntegerField(
+        verbose_name='Оценок 7',
+        default=0,
+        editable=False,
+    )
+    score_8 = models.PositiveIntegerField(
+        verbose_name='Оценок 8',
+        default=0,
+        editable=False,
+    )
+    score_9 = models.PositiveIntegerField(
+        verbose_name='Оценок 9',
+        default=0,
+        editable=False,
+    )
+    score_10 = models.PositiveIntegerField(
+        verbose_name='Оценок 10',
+        default=0,
+        editable=False,
+    )
+    search_vector = SearchVectorField(null=True, editable=False)
+    leaderboards_stale = models.BooleanField(
+        verbose_name='Пересчитать лидерборды',
+        default=True,
+        editable=False,
+    )
+
+    objects = TitleQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['id'],
+                condition=Q(leaderboards_stale=True),
+                name='title_leaderboards_stale_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    @property
+    def score_histogram(self):
+        """Количество отзывов с каждой оценкой."""
+        return {
+            score: getattr(self, score_field(score)) for score in SCORES
+        }
+
 
 class GenreTitle(models.Model):
-    genre_id = models.ForeignKey(
+    """
+    Связь произведения с жанром (Title.genre). Уникальный индекс
+    (title, genre) обслуживает жанры произведения, индекс (genre, title) —
+    фильтр по жанру, отдельные индексы внешних ключей не нужны.
+    """
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
+    genre = models.ForeignKey(
         Genre,
         on_delete=models.CASCADE,
-        db_column='genre_id'
+        db_index=False,
+    )
+
+    class Meta:
+        db_table = 'reviews_title_genre'
+        unique_together = ('title', 'genre')
+        indexes = [
+            models.Index(
+                fields=['genre', 'title'],
+                name='genre_title_genre_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.genre_id} {self.title_id}'
+
+
+class LeaderboardEntry(models.Model):
+    """
+    Место произведения в лидерборде board раздела scope: all,
+    genre:<slug> или category:<slug>. Таблицу заполняет команда
+    update_leaderboards (см. reviews/leaderboards.py).
+    """
+    TOP_RATED = 'top_rated'
+    MOST_REVIEWED = 'most_reviewed'
+    TRENDING = 'trending'
+    BOARDS = [
+        (TOP_RATED, 'Лучшие по оценке'),
+        (MOST_REVIEWED, 'Больше всего отзывов'),
+        (TRENDING, 'Популярные сейчас'),
+    ]
+    board = models.CharField(
+        verbose_name='Лидерборд',
+        max_length=20,
+        choices=BOARDS,
     )
-    title_id = models.ForeignKey(
+    scope = models.CharField(verbose_name='Раздел', max_length=60)
+    position = models.PositiveSmallIntegerField(verbose_name='Место')
+    title = models.ForeignKey(
         Title,
         on_delete=models.CASCADE,
-        db_column='title_id'
+        related_name='+',
+        verbose_name='Произведение',
     )
+    value = models.FloatField(verbose_name='Значение')
+
+    class Meta:
+        ordering = ('board', 'scope', 'position')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['board', 'scope', 'position'],
+                name='leaderboard_position_unique',
+            ),
+        ]
 
     def __str__(self):
-        return f'{self.genre_id} {self.title_id}'
+        return f'{self.board} {self.scope} #{self.position}'
 
 
 class Review(models.Model):
@@ -141,14 +351,22 @@ class Review(models.Model):
                                on_delete=models.CASCADE,
                                related_name='reviews',
                                verbose_name='Автор')
-    score = models.PositiveSmallIntegerField(verbose_name='Оценка',
-                                             validators=[MinValueValidator(1),
-                                                         MaxValueValidator(
-                                                             10)])
+    score = models.PositiveSmallIntegerField(
+        verbose_name='Оценка',
+        validators=[MinValueValidator(MIN_SCORE),
+                    MaxValueValidator(MAX_SCORE)],
+    )
     pub_date = models.DateTimeField(auto_now_add=True, db_index=True)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(
+                fields=['title', '-pub_date', '-id'],
+                name='review_title_pub_date_idx',
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['title', 'author'],
@@ -171,6 +389,55 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date', '-id'],
+                name='comment_review_pub_date_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.text
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку (см. команду send_outbox)."""
+    recipient = models.EmailField(verbose_name='Получатель', max_length=254)
+    subject = models.CharField(verbose_name='Тема', max_length=255)
+    body = models.TextField(verbose_name='Текст')
+    created = models.DateTimeField(auto_now_add=True)
+    send_after = models.DateTimeField(
+        verbose_name='Отправить не раньше',
+        default=timezone.now,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Попыток отправки',
+        default=0,
+    )
+    sent_at = models.DateTimeField(
+        verbose_name='Отправлено',
+        null=True,
+        blank=True,
+    )
+    last_error = models.TextField(verbose_name='Последняя ошибка', blank=True)
+
+    class Meta:
+        ordering = ('send_after',)
+        indexes = [
+            models.Index(
+                fields=['send_after'],
+                condition=Q(sent_at__isnull=True),
+                name='outgoing_email_pending_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
+
+    @classmethod
+    def enqueue(cls, subject, message, recipient_list):
+        """Ставит письмо в очередь вместо синхронной отправки."""
+        return cls.objects.bulk_create([
+            cls(recipient=recipient, subject=subject, body=message)
+            for recipient in recipient_list
+        ])
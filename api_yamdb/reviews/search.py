@@ -0,0 +1,77 @@
+"""
+Полнотекстовый поиск по произведениям и отзывам.
+
+На PostgreSQL поиск идёт по колонкам search_vector (tsvector с GIN-индексом),
+которые заполняют триггеры базы. На SQLite (локальный запуск и тесты)
+используются FTS5-таблицы с внешним содержимым, тоже на триггерах.
+Триггеры и индексы создают миграции 0004_search_vector и
+0009_search_trigger_columns, SQL зафиксирован в них.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+
+SEARCH_CONFIG = 'russian'
+
+
+def fts5_query(terms):
+    """Экранирует термы для MATCH: каждый — префиксная фраза."""
+    return ' '.join(
+        '"{}"*'.format(term.replace('"', '""')) for term in terms
+    )
+
+
+def search_titles(queryset, terms):
+    """
+    Фильтрует произведения по названию, описанию и текстам отзывов
+    и добавляет аннотацию search_rank (чем больше, тем релевантнее).
+    Совпадения в отзывах проверяются подзапросом IN, поэтому
+    строки произведений не дублируются.
+    """
+    from .models import Review
+
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        query = SearchQuery(' '.join(terms), config=SEARCH_CONFIG)
+        reviews = Review.objects.filter(search_vector=query)
+        return queryset.filter(
+            Q(search_vector=query)
+            | Q(pk__in=reviews.values('title_id'))
+        ).annotate(search_rank=SearchRank(F('search_vector'), query))
+    if vendor == 'sqlite':
+        match = fts5_query(terms)
+        titles = RawSQL(
+            'SELECT rowid FROM reviews_title_fts '
+            'WHERE reviews_title_fts MATCH %s',
+            (match,),
+        )
+        reviews = RawSQL(
+            'SELECT title_id FROM reviews_review WHERE id IN ('
+            'SELECT rowid FROM reviews_review_fts '
+            'WHERE reviews_review_fts MATCH %s)',
+            (match,),
+        )
+        rank = RawSQL(
+            'SELECT -bm25(reviews_title_fts, 10.0, 1.0) '
+            'FROM reviews_title_fts WHERE reviews_title_fts MATCH %s '
+            'AND reviews_title_fts.rowid = reviews_title.id',
+            (match,),
+            output_field=FloatField(),
+        )
+        return queryset.filter(
+            Q(pk__in=titles) | Q(pk__in=reviews)
+        ).annotate(search_rank=Coalesce(rank, Value(0.0)))
+    condition = Q()
+    for term in terms:
+        condition &= (
+            Q(name__icontains=term)
+            | Q(description__icontains=term)
+            | Q(pk__in=Review.objects.filter(
+                text__icontains=term
+            ).values('title_id'))
+        )
+    return queryset.filter(condition).annotate(
+        search_rank=Value(0.0, output_field=FloatField())
+    )
@@ -0,0 +1,68 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from .models import GenreTitle, LeaderboardEntry, Review, Title
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def update_title_rating(sender, instance, **kwargs):
+    """Поддерживает рейтинг произведения в актуальном состоянии."""
+    Title.objects.filter(pk=instance.title_id).update_rating()
+
+
+@receiver(post_save, sender=Title)
+def mark_title_leaderboards(sender, instance, created, **kwargs):
+    """Категория произведения могла измениться (см. reviews.leaderboards)."""
+    if not created and not instance.leaderboards_stale:
+        Title.objects.filter(pk=instance.pk).update(leaderboards_stale=True)
+        instance.leaderboards_stale = True
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def mark_genre_leaderboards(sender, instance, action, reverse, pk_set,
+                            **kwargs):
+    """
+    Жанры произведения изменились (с любой стороны связи). Новое
+    произведение уже отмечено, лишний UPDATE не нужен.
+    """
+    if not reverse and instance.leaderboards_stale:
+        return
+    if not reverse and action.startswith('post_'):
+        titles = Title.objects.filter(pk=instance.pk)
+    elif reverse and action in ('post_add', 'post_remove'):
+        titles = Title.objects.filter(pk__in=pk_set)
+    elif reverse and action == 'pre_clear':
+        titles = Title.objects.filter(genre=instance)
+    else:
+        return
+    titles.update(leaderboards_stale=True)
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def mark_genre_title_leaderboards(sender, instance, **kwargs):
+    """
+    Связь сохранена или удалена напрямую (админка, импорт), без
+    m2m_changed.
+    """
+    Title.objects.filter(pk=instance.title_id).update(
+        leaderboards_stale=True
+    )
+
+
+@receiver(pre_delete, sender=Title)
+def mark_neighbour_leaderboards(sender, instance, **kwargs):
+    """
+    Места удаляемого произведения исчезнут каскадом; соседи по его
+    разделам отмечаются, чтобы пересчёт закрыл пропуски.
+    """
+    scopes = LeaderboardEntry.objects.filter(
+        title=instance
+    ).values('scope')
+    Title.objects.filter(pk__in=LeaderboardEntry.objects.filter(
+        scope__in=scopes
+    ).exclude(title=instance).values('title')).update(
+        leaderboards_stale=True
+    )
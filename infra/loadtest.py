@@ -0,0 +1,256 @@
+"""
+Нагрузочный тест API без сторонних зависимостей.
+
+Каждый из --concurrency потоков держит своё keep-alive соединение и
+отправляет GET-запросы к --paths по кругу в течение --duration секунд.
+Пример сравнения синхронного и ASGI-воркера на одном ядре:
+
+    gunicorn api_yamdb.wsgi:application -c gunicorn.conf.py --workers 1
+    python infra/loadtest.py --concurrency 32
+
+    gunicorn api_yamdb.asgi:application -c gunicorn.conf.py --workers 1 \\
+        --worker-class uvicorn.workers.UvicornWorker
+    python infra/loadtest.py --concurrency 32
+
+С --compare скрипт сам запускает gunicorn (из api_yamdb/, с текущими
+переменными окружения базы) для каждой конфигурации из PRESETS и
+печатает пропускную способность и память (PSS) всех процессов:
+
+    python infra/loadtest.py --compare sync-1 gthread gthread-no-preload
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import signal
+import socket
+import subprocess
+import threading
+import time
+from urllib.parse import urlsplit
+
+PROJECT_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'api_yamdb'
+)
+WSGI_APP = 'api_yamdb.wsgi:application'
+ASGI_APP = 'api_yamdb.asgi:application'
+
+# Конфигурации gunicorn.conf.py для --compare: приложение и окружение.
+PRESETS = {
+    # Прежний запуск: один sync-воркер без preload и перезапусков.
+    'sync-1': (WSGI_APP, {
+        'GUNICORN_WORKER_CLASS': 'sync',
+        'GUNICORN_WORKERS': '1',
+        'GUNICORN_PRELOAD': 'false',
+        'GUNICORN_MAX_REQUESTS': '0',
+        'GUNICORN_KEEPALIVE': '2',
+    }),
+    'sync': (WSGI_APP, {'GUNICORN_WORKER_CLASS': 'sync'}),
+    'gthread': (WSGI_APP, {}),
+    'gthread-no-preload': (WSGI_APP, {'GUNICORN_PRELOAD': 'false'}),
+    'gevent': (WSGI_APP, {
+        'GUNICORN_WORKER_CLASS': 'gevent', 'DB_CONN_MAX_AGE': '0',
+    }),
+    'uvicorn': (ASGI_APP, {
+        'GUNICORN_WORKER_CLASS': 'uvicorn.workers.UvicornWorker',
+    }),
+}
+
+DEFAULT_PATHS = (
+    '/api/v1/titles/',
+    '/api/v1/titles/1/',
+    '/api/v1/titles/1/reviews/',
+    '/api/v1/titles/1/reviews/1/comments/',
+)
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(len(values) * percent / 100) - 1)]
+
+
+class Worker(threading.Thread):
+
+    def __init__(self, url, paths, headers, deadline):
+        super().__init__(daemon=True)
+        self.url = urlsplit(url)
+        self.paths = paths
+        self.headers = headers
+        self.deadline = deadline
+        self.timings = []
+        self.errors = 0
+
+    def connect(self):
+        connection_class = (
+            http.client.HTTPSConnection if self.url.scheme == 'https'
+            else http.client.HTTPConnection
+        )
+        return connection_class(self.url.netloc, timeout=60)
+
+    def run(self):
+        connection = self.connect()
+        number = 0
+        while time.monotonic() < self.deadline:
+            path = self.url.path.rstrip('/') + self.paths[
+                number % len(self.paths)
+            ]
+            number += 1
+            start = time.perf_counter()
+            try:
+                connection.request('GET', path, headers=self.headers)
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                self.errors += 1
+                connection.close()
+                connection = self.connect()
+                continue
+            if response.status >= 400:
+                self.errors += 1
+            else:
+                self.timings.append((time.perf_counter() - start) * 1000)
+        connection.close()
+
+
+def run(url, paths, concurrency, duration, token=None):
+    headers = {'Accept': 'application/json'}
+    if token:
+        headers['Authorization'] = f'Bearer {token}'
+    deadline = time.monotonic() + duration
+    workers = [
+        Worker(url, paths, headers, deadline) for _ in range(concurrency)
+    ]
+    start = time.monotonic()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.monotonic() - start
+    timings = [timing for worker in workers for timing in worker.timings]
+    return {
+        'concurrency': concurrency,
+        'requests': len(timings),
+        'errors': sum(worker.errors for worker in workers),
+        'rps': round(len(timings) / elapsed, 1),
+        'p50_ms': round(percentile(timings, 50), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'p99_ms': round(percentile(timings, 99), 2),
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    parts = urlsplit(url)
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection(parts.netloc, timeout=5)
+            connection.request('GET', '/api/v1/')
+            connection.getresponse().read()
+            connection.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'{url} не ответил за {timeout} с')
+
+
+def process_tree(pid):
+    pids = [pid]
+    for parent in pids:
+        for task in os.listdir(f'/proc/{parent}/task'):
+            with open(f'/proc/{parent}/task/{task}/children') as file:
+                pids.extend(int(child) for child in file.read().split())
+    return pids
+
+
+def memory_mb(pid):
+    """Суммарный PSS процесса и его потомков: общие страницы делятся."""
+    total = 0
+    try:
+        for child in process_tree(pid):
+            with open(f'/proc/{child}/smaps_rollup') as file:
+                for line in file:
+                    if line.startswith('Pss:'):
+                        total += int(line.split()[1])
+    except OSError:
+        return None
+    return round(total / 1024, 1)
+
+
+def compare(presets, paths, concurrency, duration, token=None):
+    for name in presets:
+        app, overrides = PRESETS[name]
+        port = free_port()
+        url = f'http://127.0.0.1:{port}'
+        env = dict(os.environ, **overrides)
+        env['GUNICORN_BIND'] = f'127.0.0.1:{port}'
+        env['PROMETHEUS_MULTIPROC_DIR'] = f'/tmp/loadtest-prometheus-{port}'
+        server = subprocess.Popen(
+            ['gunicorn', app, '--config', 'gunicorn.conf.py'],
+            cwd=PROJECT_DIR, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_ready(url)
+            for level in concurrency:
+                result = run(url, paths, level, duration, token)
+                result['preset'] = name
+                result['memory_mb'] = memory_mb(server.pid)
+                yield result
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[8])
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument(
+        '--token', help='JWT-токен: авторизованные запросы минуют кэш.'
+    )
+    parser.add_argument(
+        '--compare', nargs='+', choices=PRESETS, metavar='PRESET',
+        help=f'Запустить gunicorn в конфигурациях: {", ".join(PRESETS)}.',
+    )
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+    if args.compare:
+        results = compare(
+            args.compare, args.paths, args.concurrency, args.duration,
+            args.token,
+        )
+    else:
+        results = (
+            run(args.url, args.paths, level, args.duration, args.token)
+            for level in args.concurrency
+        )
+    for result in results:
+        if args.json:
+            print(json.dumps(result))
+            continue
+        print(
+            f'{result.get("preset", args.url):<20} '
+            f'concurrency={result["concurrency"]:<4} '
+            f'rps={result["rps"]:<8} p50={result["p50_ms"]}ms '
+            f'p95={result["p95_ms"]}ms p99={result["p99_ms"]}ms '
+            f'errors={result["errors"]}'
+            + (
+                f' memory={result["memory_mb"]}MB'
+                if result.get('memory_mb') else ''
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
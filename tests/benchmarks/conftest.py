@@ -0,0 +1,97 @@
+"""
+Бенчмарк эндпоинтов API: число запросов к базе, задержка p50/p99
+и пиковая память на запрос.
+
+Размер данных и режим задаются переменными окружения:
+    BENCH_TITLES, BENCH_REVIEWS, BENCH_COMMENTS — объём каталога;
+    BENCH_ITERATIONS — число замеров задержки на эндпоинт;
+    BENCH_CHECK_TIMINGS=1 — сравнивать задержку и память с базовой
+        линией (они зависят от машины, поэтому по умолчанию
+        проверяется только число запросов);
+    BENCH_TOLERANCE — допустимый рост задержки и памяти, в разах;
+    BENCH_UPDATE_BASELINE=1 — записать результаты в baseline.json;
+    BENCH_REPORT=<путь> — сохранить результаты прогона в JSON.
+"""
+import json
+import os
+from os.path import dirname, join
+
+import pytest
+
+BASELINE_PATH = join(dirname(__file__), 'baseline.json')
+
+TITLES = int(os.getenv('BENCH_TITLES', 200))
+REVIEWS = int(os.getenv('BENCH_REVIEWS', 2000))
+COMMENTS = int(os.getenv('BENCH_COMMENTS', 1000))
+ITERATIONS = int(os.getenv('BENCH_ITERATIONS', 10))
+CHECK_TIMINGS = os.getenv('BENCH_CHECK_TIMINGS') == '1'
+TOLERANCE = float(os.getenv('BENCH_TOLERANCE', 1.5))
+UPDATE_BASELINE = os.getenv('BENCH_UPDATE_BASELINE') == '1'
+REPORT_PATH = os.getenv('BENCH_REPORT')
+
+# Результаты текущего прогона: {эндпоинт: метрики}.
+RESULTS = {}
+
+
+def profile():
+    """Ключ базовой линии: СУБД и объём данных."""
+    from django.db import connection
+
+    return f'{connection.vendor}-{TITLES}-{REVIEWS}-{COMMENTS}'
+
+
+def load_baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, encoding='utf-8') as file:
+        return json.load(file)
+
+
+@pytest.fixture(scope='module')
+def bench_data(django_db_setup, django_db_blocker):
+    """Наполняет базу один раз на модуль и очищает её после."""
+    from django.core.management import call_command
+
+    from .seed import seed
+
+    if TITLES < 100:
+        pytest.fail('BENCH_TITLES должно быть не меньше 100')
+    with django_db_blocker.unblock():
+        seed(TITLES, REVIEWS, COMMENTS)
+        yield profile()
+        call_command('flush', interactive=False, verbosity=0)
+
+
+@pytest.fixture(scope='session')
+def baseline():
+    return load_baseline()
+
+
+def pytest_sessionfinish(session):
+    if not RESULTS:
+        return
+    if REPORT_PATH:
+        with open(REPORT_PATH, 'w', encoding='utf-8') as file:
+            json.dump(RESULTS, file, ensure_ascii=False, indent=2)
+    if UPDATE_BASELINE:
+        data = load_baseline()
+        data.setdefault(profile(), {}).update(RESULTS)
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, indent=2,
+                      sort_keys=True)
+            file.write('\n')
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not RESULTS:
+        return
+    terminalreporter.section(f'benchmark {profile()}')
+    terminalreporter.write_line(
+        f'{"endpoint":<28}{"queries":>8}{"p50, мс":>10}{"p99, мс":>10}'
+        f'{"память, КБ":>12}'
+    )
+    for name, result in sorted(RESULTS.items()):
+        terminalreporter.write_line(
+            f'{name:<28}{result["queries"]:>8}{result["p50_ms"]:>10.2f}'
+            f'{result["p99_ms"]:>10.2f}{result["peak_kb"]:>12.1f}'
+        )
@@ -0,0 +1,105 @@
+"""Синтетический каталог для бенчмарков."""
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection
+
+WORDS = (
+    'драма', 'комедия', 'история', 'любовь', 'война', 'море', 'город',
+    'детство', 'дорога', 'зима', 'тайна', 'семья', 'музыка', 'космос',
+)
+CATEGORIES = 10
+GENRES = 20
+BATCH_SIZE = 10000
+
+BENCH_USER = 'bench_user'
+BENCH_ADMIN = 'bench_admin'
+
+
+def words(number, count):
+    return ' '.join(
+        WORDS[(number * 7 + i * 3) % len(WORDS)] for i in range(count)
+    )
+
+
+def save(model, objects):
+    objects = iter(objects)
+    while True:
+        batch = list(islice(objects, BATCH_SIZE))
+        if not batch:
+            return
+        model.objects.bulk_create(batch)
+
+
+def seed(titles, reviews, comments):
+    """
+    Заполняет базу: titles произведений, reviews отзывов, равномерно
+    распределённых по произведениям, и comments комментариев.
+    Первичные ключи задаются явно и идут подряд с 1.
+    """
+    from reviews.leaderboards import refresh_leaderboards
+    from reviews.models import Category, Comment, Genre, Review, Title, User
+
+    authors = max(1, -(-reviews // titles))
+    password = make_password(None)
+    save(User, [
+        User(id=1, username=BENCH_USER, email='user@bench.fake',
+             password=password),
+        User(id=2, username=BENCH_ADMIN, email='admin@bench.fake',
+             password=password, role='admin'),
+    ] + [
+        User(id=i + 3, username=f'bench{i}', email=f'bench{i}@bench.fake',
+             password=password)
+        for i in range(authors)
+    ])
+    save(Category, (
+        Category(id=i + 1, name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(CATEGORIES)
+    ))
+    save(Genre, (
+        Genre(id=i + 1, name=f'Жанр {i}', slug=f'genre-{i}')
+        for i in range(GENRES)
+    ))
+    save(Title, (
+        Title(
+            id=i + 1,
+            name=f'Произведение {i} {words(i, 2)}',
+            year=1900 + i % 120,
+            description=words(i, 12),
+            category_id=i % CATEGORIES + 1,
+        )
+        for i in range(titles)
+    ))
+    through = Title.genre.through
+    save(through, (
+        through(title_id=i // 2 + 1, genre_id=(i // 2 + i % 2 * 7) % GENRES + 1)
+        for i in range(titles * 2)
+    ))
+    save(Review, (
+        Review(
+            id=i + 1,
+            title_id=i % titles + 1,
+            author_id=i // titles + 3,
+            text=words(i, 30),
+            score=i * 7 % 10 + 1,
+        )
+        for i in range(reviews)
+    ))
+    save(Comment, (
+        Comment(
+            id=i + 1,
+            review_id=i % reviews + 1,
+            author_id=i % authors + 3,
+            text=words(i, 10),
+        )
+        for i in range(comments if reviews else 0)
+    ))
+    Title.objects.update_rating()
+    refresh_leaderboards(full=True)
+    statements = connection.ops.sequence_reset_sql(
+        no_style(), [User, Category, Genre, Title, Review, Comment]
+    )
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
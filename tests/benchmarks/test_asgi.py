@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from .conftest import RESULTS
+from .test_endpoints import percentile
+
+# Задержка каждого SQL-запроса: имитирует медленную базу, на которой
+# синхронный воркер простаивает, ожидая ответа.
+QUERY_DELAY = 0.02
+REQUESTS = 10
+PATH = '/api/v1/titles/?page=2'
+
+
+class SlowQueries:
+    """Наблюдатель запросов, добавляющий задержку и считающий запросы."""
+
+    def __init__(self):
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        time.sleep(QUERY_DELAY)
+        return execute(sql, params, many, context)
+
+
+def summary(timings, total, queries):
+    return {
+        'queries': queries // REQUESTS,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'peak_kb': 0.0,
+        'total_ms': round(total * 1000, 3),
+    }
+
+
+def sync_run(client, headers):
+    timings = []
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        begin = time.perf_counter()
+        assert client.get(PATH, **headers).status_code == 200
+        timings.append((time.perf_counter() - begin) * 1000)
+    return timings, time.perf_counter() - start
+
+
+async def async_run(client, headers):
+    async def one():
+        begin = time.perf_counter()
+        response = await client.get(PATH, **headers)
+        assert response.status_code == 200
+        return (time.perf_counter() - begin) * 1000
+
+    start = time.perf_counter()
+    timings = await asyncio.gather(*(one() for _ in range(REQUESTS)))
+    return timings, time.perf_counter() - start
+
+
+@pytest.mark.django_db(transaction=True)
+def test_asgi_concurrency(settings, catalog, user):
+    """
+    Один процесс: синхронный путь обслуживает запросы по очереди,
+    асинхронный — параллельно в пуле потоков, пока цикл событий ждёт
+    базу. Запросы авторизованы, чтобы не попадать в кэш ответов.
+    """
+    from api.db import observe_queries
+    from django.test import AsyncClient, Client
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    token = f'Bearer {AccessToken.for_user(user)}'
+    Client().get(PATH, HTTP_AUTHORIZATION=token)
+    with observe_queries(SlowQueries()) as observer:
+        sync = RESULTS['wsgi-titles-sequential'] = summary(
+            *sync_run(Client(), {'HTTP_AUTHORIZATION': token}),
+            observer.queries,
+        )
+    settings.ROOT_URLCONF = 'api_yamdb.urls_asgi'
+    with observe_queries(SlowQueries()) as observer:
+        concurrent = RESULTS['asgi-titles-concurrent'] = summary(
+            *async_to_sync(async_run)(
+                AsyncClient(), {'authorization': token}
+            ),
+            observer.queries,
+        )
+    assert sync['queries'] == concurrent['queries'] > 0
+    assert concurrent['total_ms'] < sync['total_ms'] / 2
@@ -0,0 +1,53 @@
+import time
+
+import pytest
+from django.core.signals import request_finished, request_started
+from django.db import connection
+
+from .conftest import ITERATIONS, RESULTS
+from .test_endpoints import percentile
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'postgresql',
+    reason='Соединения SQLite в памяти не закрываются между запросами',
+)
+
+
+def request_cycle():
+    """Жизненный цикл соединения в запросе без самого HTTP."""
+    request_started.send(sender=None)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    finally:
+        request_finished.send(sender=None)
+
+
+def measure(iterations):
+    request_cycle()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        request_cycle()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'queries': 1,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'peak_kb': 0.0,
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+def test_persistent_connections(monkeypatch):
+    """Задержка запроса с новым соединением и с переиспользуемым."""
+    iterations = max(ITERATIONS, 50)
+    results = {}
+    for max_age in (0, 60):
+        connection.close()
+        monkeypatch.setitem(connection.settings_dict, 'CONN_MAX_AGE', max_age)
+        results[max_age] = RESULTS[f'connection-max-age-{max_age}'] = (
+            measure(iterations)
+        )
+    connection.close()
+    assert results[60]['p50_ms'] < results[0]['p50_ms']
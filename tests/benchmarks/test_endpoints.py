@@ -0,0 +1,236 @@
+import math
+import time
+import tracemalloc
+from collections import namedtuple
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .conftest import (CHECK_TIMINGS, ITERATIONS, RESULTS, TOLERANCE,
+                       UPDATE_BASELINE)
+from .seed import BENCH_ADMIN, BENCH_USER
+
+# route — имя маршрута из api/urls.py, prepare(i) возвращает путь и
+# тело i-го запроса; подготовка не входит в замеры.
+Endpoint = namedtuple(
+    'Endpoint', 'name route method role status prepare iterations'
+)
+
+
+def fixed(path, data=None):
+    return lambda i: (path, data)
+
+
+def endpoint(name, route, prepare, method='get', role='user', status=200,
+             iterations=None):
+    return Endpoint(name, route, method, role, status, prepare, iterations)
+
+
+def create_category(i):
+    from reviews.models import Category
+
+    Category.objects.create(name=f'Удаляемая {i}', slug=f'delete-{i}')
+    return f'/api/v1/categories/delete-{i}/', None
+
+
+def create_genre(i):
+    from reviews.models import Genre
+
+    Genre.objects.create(name=f'Удаляемый {i}', slug=f'delete-{i}')
+    return f'/api/v1/genres/delete-{i}/', None
+
+
+ENDPOINTS = [
+    endpoint('api-root', 'api-root', fixed('/api/v1/')),
+    endpoint('categories-list', 'categories-list',
+             fixed('/api/v1/categories/')),
+    endpoint('categories-list-anon', 'categories-list',
+             fixed('/api/v1/categories/'), role='anon'),
+    endpoint('categories-create', 'categories-list', lambda i: (
+        '/api/v1/categories/', {'name': f'Новая {i}', 'slug': f'new-{i}'}
+    ), method='post', role='admin', status=201),
+    endpoint('categories-delete', 'categories-detail', create_category,
+             method='delete', role='admin', status=204),
+    endpoint('genres-list', 'genres-list', fixed('/api/v1/genres/')),
+    endpoint('genres-delete', 'genres-detail', create_genre,
+             method='delete', role='admin', status=204),
+    endpoint('titles-list', 'titles-list', fixed('/api/v1/titles/')),
+    endpoint('titles-list-anon', 'titles-list', fixed('/api/v1/titles/'),
+             role='anon'),
+    endpoint('titles-list-cursor', 'titles-list',
+             fixed('/api/v1/titles/?cursor=')),
+    endpoint('titles-list-deep-page', 'titles-list',
+             lambda i: (f'/api/v1/titles/?page={i % 5 + 5}', None)),
+    endpoint('titles-filter', 'titles-list', fixed(
+        '/api/v1/titles/?genre=genre-1,genre-8&category=category-1'
+        '&min_rating=2'
+    )),
+    endpoint('titles-search', 'titles-list',
+             fixed('/api/v1/titles/?search=драма')),
+    endpoint('titles-ordering', 'titles-list',
+             fixed('/api/v1/titles/?ordering=-rating')),
+    endpoint('titles-list-sparse', 'titles-list',
+             fixed('/api/v1/titles/?fields=id,name,rating')),
+    endpoint('titles-detail', 'titles-detail', fixed('/api/v1/titles/1/')),
+    endpoint('titles-detail-expand', 'titles-detail',
+             fixed('/api/v1/titles/1/?expand=reviews')),
+    endpoint('leaderboards', 'leaderboards-list',
+             fixed('/api/v1/leaderboards/top_rated/?genre=genre-1')),
+    endpoint('titles-create', 'titles-list', lambda i: ('/api/v1/titles/', {
+        'name': f'Новое {i}', 'year': 2000, 'category': 'category-1',
+        'genre': ['genre-1', 'genre-2'],
+    }), method='post', role='admin', status=201),
+    endpoint('titles-batch', 'titles-batch', lambda i: (
+        '/api/v1/titles/batch/', [{
+            'name': f'Пакет {i}-{j}', 'year': 2000,
+            'category': 'category-1', 'genre': ['genre-1', 'genre-2'],
+        } for j in range(10)]
+    ), method='post', role='admin', status=201),
+    endpoint('reviews-list', 'reviews-list',
+             fixed('/api/v1/titles/1/reviews/')),
+    endpoint('reviews-list-sparse', 'reviews-list',
+             fixed('/api/v1/titles/1/reviews/?fields=id,score')),
+    endpoint('reviews-detail', 'reviews-detail',
+             fixed('/api/v1/titles/1/reviews/1/')),
+    endpoint('reviews-create', 'reviews-list', lambda i: (
+        f'/api/v1/titles/{i + 2}/reviews/', {'text': 'Отзыв', 'score': 7}
+    ), method='post', status=201),
+    endpoint('reviews-batch', 'reviews-batch', lambda i: (
+        '/api/v1/reviews/batch/', [{
+            'title': 50 + i * 5 + j, 'text': 'Отзыв', 'score': 5,
+        } for j in range(5)]
+    ), method='post', status=201),
+    endpoint('comments-list', 'comments-list',
+             fixed('/api/v1/titles/1/reviews/1/comments/')),
+    endpoint('comments-detail', 'comments-detail',
+             fixed('/api/v1/titles/1/reviews/1/comments/1/')),
+    endpoint('comments-create', 'comments-list', lambda i: (
+        '/api/v1/titles/1/reviews/1/comments/', {'text': f'Ответ {i}'}
+    ), method='post', status=201),
+    endpoint('users-list', 'users-list', fixed('/api/v1/users/'),
+             role='admin'),
+    endpoint('users-detail', 'users-detail',
+             fixed(f'/api/v1/users/{BENCH_USER}/'), role='admin'),
+    endpoint('users-me', 'users-users-own-profile', fixed('/api/v1/users/me/')),
+    endpoint('register', 'register', lambda i: ('/api/v1/auth/signup/', {
+        'username': f'signup{i}', 'email': f'signup{i}@bench.fake',
+    }), method='post', role='anon'),
+    endpoint('token', 'token', fixed('/api/v1/auth/token/', {
+        'username': BENCH_USER, 'confirmation_code': 'wrong',
+    }), method='post', role='anon', status=400),
+    endpoint('profiling', 'profiling', fixed('/api/v1/profiling/'),
+             role='admin'),
+    endpoint('export-titles', 'export', fixed('/api/v1/export/titles/'),
+             role='admin', iterations=3),
+    endpoint('export-reviews', 'export', fixed('/api/v1/export/reviews/'),
+             role='admin', iterations=3),
+    endpoint('export-comments', 'export',
+             fixed('/api/v1/export/comments/?format=csv'), role='admin',
+             iterations=3),
+]
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[max(0, math.ceil(len(values) * percent / 100) - 1)]
+
+
+def make_client(role):
+    from reviews.models import User
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    client = APIClient()
+    if role != 'anon':
+        user = User.objects.get(
+            username=BENCH_ADMIN if role == 'admin' else BENCH_USER
+        )
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+        )
+    return client
+
+
+def send(client, bench, path, data):
+    response = getattr(client, bench.method)(path, data, format='json')
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    assert response.status_code == bench.status, response.content
+
+
+def measure(bench):
+    """
+    Прогрев, затем замер числа запросов, задержки и пиковой памяти.
+    Запросы prepare выполняются до замеров и в них не попадают.
+    """
+    client = make_client(bench.role)
+    iterations = bench.iterations or ITERATIONS
+    requests = (bench.prepare(i) for i in range(iterations + 3))
+    send(client, bench, *next(requests))
+
+    path, data = next(requests)
+    with CaptureQueriesContext(connection) as context:
+        send(client, bench, path, data)
+    queries = len(context.captured_queries)
+
+    timings = []
+    for _ in range(iterations):
+        path, data = next(requests)
+        start = time.perf_counter()
+        send(client, bench, path, data)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    path, data = next(requests)
+    tracemalloc.start()
+    try:
+        send(client, bench, path, data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'queries': queries,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def test_all_routes_covered():
+    from api.urls import urlpatterns
+    from django.urls import URLResolver
+
+    def names(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from names(pattern.url_patterns)
+            elif pattern.name:
+                yield pattern.name
+
+    assert set(names(urlpatterns)) <= {bench.route for bench in ENDPOINTS}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('bench', ENDPOINTS, ids=lambda bench: bench.name)
+def test_endpoint(bench, bench_data, baseline):
+    result = measure(bench)
+    RESULTS[bench.name] = result
+    if UPDATE_BASELINE:
+        return
+    expected = baseline.get(bench_data, {}).get(bench.name)
+    if expected is None:
+        pytest.skip(
+            f'Нет базовой линии для {bench_data}, '
+            'запустите с BENCH_UPDATE_BASELINE=1'
+        )
+    assert result['queries'] <= expected['queries'], (
+        f'{bench.name}: запросов {result["queries"]}, '
+        f'в базовой линии {expected["queries"]}'
+    )
+    if CHECK_TIMINGS:
+        for metric in ('p50_ms', 'p99_ms', 'peak_kb'):
+            assert result[metric] <= expected[metric] * TOLERANCE, (
+                f'{bench.name}: {metric} {result[metric]}, '
+                f'в базовой линии {expected[metric]}'
+            )
@@ -0,0 +1,114 @@
+import time
+import tracemalloc
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .conftest import ITERATIONS, RESULTS
+from .test_endpoints import percentile
+
+PAGE_SIZES = (5, 100, 1000)
+# Свой каталог: страница в 1000 объектов каждого вида.
+OBJECTS = max(PAGE_SIZES)
+
+
+@pytest.fixture(scope='module')
+def page_data(django_db_setup, django_db_blocker):
+    from django.core.management import call_command
+
+    from .seed import seed
+
+    with django_db_blocker.unblock():
+        seed(OBJECTS, OBJECTS, OBJECTS)
+        yield
+        call_command('flush', interactive=False, verbosity=0)
+
+
+def resources():
+    """Сериализатор, запрос обычного пути и запрос быстрого пути."""
+    from api.serializers import (CommentSerializer, ReviewSerializer,
+                                 TitleShowSerializer)
+    from reviews.models import Comment, Review, Title
+
+    return {
+        'titles': (
+            TitleShowSerializer,
+            Title.objects.select_related('category')
+            .prefetch_related('genre').order_by('-id'),
+            Title.objects.order_by('-id'),
+        ),
+        'reviews': (
+            ReviewSerializer,
+            Review.objects.select_related('author')
+            .order_by('-pub_date', '-id'),
+            Review.objects.order_by('-pub_date', '-id'),
+        ),
+        'comments': (
+            CommentSerializer,
+            Comment.objects.select_related('author')
+            .order_by('-pub_date', '-id'),
+            Comment.objects.order_by('-pub_date', '-id'),
+        ),
+    }
+
+
+def drf_page(serializer_class, queryset, fast_queryset, size):
+    from rest_framework.renderers import JSONRenderer
+
+    return JSONRenderer().render(
+        serializer_class(queryset[:size], many=True).data
+    )
+
+
+def fast_page(serializer_class, queryset, fast_queryset, size):
+    from api.fast import ReadPlan
+    from api.renderers import FastJSONRenderer
+
+    plan = ReadPlan(serializer_class())
+    return FastJSONRenderer().render(
+        plan.render(fast_queryset.values(*plan.columns)[:size])
+    )
+
+
+def measure(render, *args):
+    """Запросы, задержка и пиковая память чтения страницы в JSON."""
+    render(*args)
+    with CaptureQueriesContext(connection) as context:
+        content = render(*args)
+    timings = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        render(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    try:
+        render(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return content, {
+        'queries': len(context.captured_queries),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('size', PAGE_SIZES)
+@pytest.mark.parametrize('resource', ('titles', 'reviews', 'comments'))
+def test_fast_serialization(resource, size, page_data):
+    """
+    Страница size объектов: ModelSerializer и JSONRenderer против
+    ReadPlan и FastJSONRenderer. Ответы совпадают байт в байт.
+    """
+    args = (*resources()[resource], size)
+    drf_content, drf = measure(drf_page, *args)
+    fast_content, fast = measure(fast_page, *args)
+    RESULTS[f'serialize-{resource}-{size}'] = drf
+    RESULTS[f'serialize-{resource}-{size}-fast'] = fast
+    assert fast_content == drf_content
+    assert fast['queries'] == drf['queries']
+    if size >= 100:
+        assert fast['p50_ms'] < drf['p50_ms']
@@ -0,0 +1,84 @@
+import pytest
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestUser', email='testuser@yamdb.fake', password='1234567'
+    )
+
+
+@pytest.fixture
+def admin(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestAdmin', email='testadmin@yamdb.fake',
+        password='1234567', role='admin'
+    )
+
+
+@pytest.fixture
+def user_client(user):
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.fixture
+def admin_client(admin):
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client
+
+
+@pytest.fixture
+def anon_client():
+    from rest_framework.test import APIClient
+
+    return APIClient()
+
+
+@pytest.fixture
+def catalog(django_user_model):
+    """Небольшой каталог: категории, жанры, произведения с отзывами."""
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    movie = Category.objects.create(name='Фильм', slug='movie')
+    book = Category.objects.create(name='Книга', slug='book')
+    drama = Genre.objects.create(name='Драма', slug='drama')
+    comedy = Genre.objects.create(name='Комедия', slug='comedy')
+    melodrama = Genre.objects.create(name='Мелодрама', slug='melodrama')
+    authors = [
+        django_user_model.objects.create_user(
+            username=f'author{i}', email=f'author{i}@yamdb.fake'
+        )
+        for i in range(3)
+    ]
+    titles = []
+    for i in range(12):
+        title = Title.objects.create(
+            name=f'Произведение {i}',
+            year=1990 + i,
+            description=f'Описание {i}',
+            category=movie if i % 2 else book,
+        )
+        title.genre.set([drama, comedy] if i % 3 else [melodrama])
+        titles.append(title)
+    for i, title in enumerate(titles[:6]):
+        for j, author in enumerate(authors):
+            review = Review.objects.create(
+                title=title, author=author, text=f'Отзыв {i}-{j}',
+                score=(i + j) % 10 + 1,
+            )
+            Comment.objects.create(
+                review=review, author=authors[0], text=f'Комментарий {i}-{j}'
+            )
+    return {
+        'categories': [movie, book],
+        'genres': [drama, comedy, melodrama],
+        'titles': titles,
+        'authors': authors,
+    }
@@ -0,0 +1,25 @@
+import os
+
+from api_yamdb.settings import *  # noqa: F401,F403
+
+# Без явно заданного DB_ENGINE тесты работают на SQLite в памяти,
+# с ним — на указанной базе (например, локальном PostgreSQL).
+if not os.getenv('DB_ENGINE'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        },
+    }
+
+# Отдельная база в роли реплики: её используют только тесты, которые
+# явно включают DATABASE_REPLICAS (tests/test_replicas.py). База в
+# памяти SQLite и так своя у каждого соединения, остальным нужно
+# другое имя.
+DATABASES['replica'] = {**DATABASES['default']}  # noqa: F405
+if DATABASES['replica']['NAME'] != ':memory:':
+    DATABASES['replica']['NAME'] += '_replica'
+DATABASE_REPLICAS = []
+
+# Тесты идут в одном процессе, LocMemCache для кэша ответов достаточно.
+RESPONSE_CACHE_ENABLED = True
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+
+
+@pytest.fixture
+def asgi(settings):
+    from django.test import AsyncClient
+
+    settings.ROOT_URLCONF = 'api_yamdb.urls_asgi'
+    return AsyncClient()
+
+
+def send(client, method, path, *args, **kwargs):
+    """Синхронно выполняет запрос AsyncClient."""
+    async def request():
+        return await getattr(client, method)(path, *args, **kwargs)
+
+    return async_to_sync(request)()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsgi:
+
+    def test_read_endpoints_are_async(self, settings):
+        from django.urls import resolve
+
+        settings.ROOT_URLCONF = 'api_yamdb.urls_asgi'
+        for path in (
+            '/api/v1/titles/', '/api/v1/titles/1/',
+            '/api/v1/titles/1/reviews/', '/api/v1/titles/1/reviews/1/',
+            '/api/v1/titles/1/reviews/1/comments/',
+            '/api/v1/titles/1/reviews/1/comments/1/',
+        ):
+            assert asyncio.iscoroutinefunction(resolve(path).func), path
+        for path in ('/api/v1/users/', '/api/v1/categories/'):
+            assert not asyncio.iscoroutinefunction(resolve(path).func), path
+
+    def test_sync_urlconf_unchanged(self):
+        from django.urls import resolve
+
+        assert not asyncio.iscoroutinefunction(
+            resolve('/api/v1/titles/').func
+        )
+
+    def test_read_endpoints(self, asgi, catalog):
+        title = catalog['titles'][0]
+        response = send(asgi, 'get', '/api/v1/titles/')
+        assert response.status_code == 200
+        assert response.json()['count'] == len(catalog['titles'])
+        response = send(asgi, 'get', f'/api/v1/titles/{title.pk}/')
+        assert response.status_code == 200
+        assert response.json()['name'] == title.name
+        response = send(asgi, 'get', f'/api/v1/titles/{title.pk}/reviews/')
+        assert response.status_code == 200
+        review = response.json()['results'][0]
+        response = send(
+            asgi, 'get',
+            f'/api/v1/titles/{title.pk}/reviews/{review["id"]}/comments/'
+        )
+        assert response.status_code == 200
+        assert response.json()['count'] == 1
+
+    def test_writes_through_async_route(self, asgi, admin, catalog):
+        from reviews.models import Title
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        response = send(
+            asgi, 'post', '/api/v1/titles/',
+            {'name': 'Новое', 'year': 2000, 'category': 'movie',
+             'genre': ['drama']},
+            content_type='application/json',
+            authorization=f'Bearer {AccessToken.for_user(admin)}',
+        )
+        assert response.status_code == 201
+        assert Title.objects.filter(name='Новое').exists()
+
+    def test_profiling_sees_pool_thread_queries(self, asgi, settings, catalog):
+        settings.REQUEST_PROFILING = True
+        response = send(asgi, 'get', '/api/v1/titles/')
+        assert response.status_code == 200
+        assert 'desc="0 queries"' not in response['Server-Timing']
+
+    def test_export_is_wsgi_only(self, asgi, admin, catalog):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        response = send(
+            asgi, 'get', '/api/v1/export/reviews/',
+            authorization=f'Bearer {AccessToken.for_user(admin)}',
+        )
+        assert response.status_code == 404, (
+            'Под ASGI поток выгрузки читал бы базу в цикле событий'
+        )
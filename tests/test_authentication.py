@@ -0,0 +1,86 @@
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+def jwt_client(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+    return client
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+
+    def user_queries(self, context):
+        return [
+            query for query in context.captured_queries
+            if 'FROM "reviews_user"' in query['sql']
+        ]
+
+    def test_user_is_loaded_once(self, user):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        client = jwt_client(user)
+        url = '/api/v1/titles/'
+        with CaptureQueriesContext(connection) as context:
+            assert client.get(url).status_code == 200
+        assert len(self.user_queries(context)) == 1
+        with CaptureQueriesContext(connection) as context:
+            assert client.get(url).status_code == 200
+        assert self.user_queries(context) == []
+
+    def test_only_auth_fields_are_cached(self, user, settings):
+        from api.authentication import CACHED_USER_FIELDS, user_cache_key
+        from django.core.cache import caches
+
+        assert jwt_client(user).get('/api/v1/users/me/').status_code == 200
+        cached = caches[settings.USER_CACHE_ALIAS].get(user_cache_key(user.pk))
+        assert set(cached) == set(CACHED_USER_FIELDS)
+        assert cached['username'] == user.username
+
+    def test_role_change_is_visible(self, user, admin_client,
+                                    django_capture_on_commit_callbacks):
+        client = jwt_client(user)
+        assert client.get('/api/v1/users/').status_code == 403
+        with django_capture_on_commit_callbacks(execute=True):
+            response = admin_client.patch(
+                f'/api/v1/users/{user.username}/', {'role': 'admin'}
+            )
+        assert response.status_code == 200
+        assert client.get('/api/v1/users/').status_code == 200
+
+    def test_deactivated_user_is_rejected(self, user,
+                                          django_capture_on_commit_callbacks):
+        client = jwt_client(user)
+        assert client.get('/api/v1/users/me/').status_code == 200
+        user.is_active = False
+        with django_capture_on_commit_callbacks(execute=True):
+            user.save()
+        assert client.get('/api/v1/users/me/').status_code == 401
+
+    def test_invalidated_after_commit(self, user,
+                                      django_capture_on_commit_callbacks):
+        client = jwt_client(user)
+        assert client.get('/api/v1/users/me/').status_code == 200
+        with django_capture_on_commit_callbacks() as callbacks:
+            user.is_active = False
+            user.save()
+            # До коммита в кэше остаётся прежняя запись.
+            assert client.get('/api/v1/users/me/').status_code == 200
+        for callback in callbacks:
+            callback()
+        assert client.get('/api/v1/users/me/').status_code == 401
+
+    def test_profile_update_uses_fresh_row(self, user):
+        from reviews.models import User
+
+        client = jwt_client(user)
+        client.get('/api/v1/users/me/')
+        User.objects.filter(pk=user.pk).update(role='moderator')
+        response = client.patch('/api/v1/users/me/', {'bio': 'Обо мне'})
+        assert response.status_code == 200
+        assert response.json()['role'] == 'moderator'
+        user.refresh_from_db()
+        assert (user.role, user.bio) == ('moderator', 'Обо мне')
@@ -0,0 +1,99 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestTitlesBatch:
+    url = '/api/v1/titles/batch/'
+
+    def items(self, count):
+        return [
+            {
+                'name': f'Новинка {i}', 'year': 2000 + i,
+                'category': 'movie', 'genre': ['drama', 'comedy'],
+            }
+            for i in range(count)
+        ]
+
+    def test_only_admin(self, user_client, catalog):
+        response = user_client.post(self.url, self.items(1), format='json')
+        assert response.status_code == 403
+
+    @pytest.mark.parametrize('count', [2, 20])
+    def test_batch_create(self, admin_client, catalog, count,
+                          django_assert_max_num_queries):
+        from reviews.models import Title
+
+        before = Title.objects.count()
+        with django_assert_max_num_queries(count + 10):
+            response = admin_client.post(
+                self.url, self.items(count), format='json'
+            )
+        assert response.status_code == 201
+        assert Title.objects.count() == before + count
+        data = response.json()
+        assert [title['name'] for title in data] == [
+            f'Новинка {i}' for i in range(count)
+        ]
+        assert sorted(data[0]['genre']) == ['comedy', 'drama']
+        assert data[0]['category'] == 'movie'
+
+    def test_errors_are_reported_per_item(self, admin_client, catalog):
+        from reviews.models import Title
+
+        before = Title.objects.count()
+        items = self.items(3)
+        items[1]['category'] = 'nope'
+        items[2]['genre'] = ['drama', 'nope']
+        items[2]['year'] = 3000
+        response = admin_client.post(self.url, items, format='json')
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {}
+        assert set(errors[1]) == {'category'}
+        assert set(errors[2]) == {'year'}
+        assert Title.objects.count() == before
+
+
+@pytest.mark.django_db
+class TestReviewsBatch:
+    url = '/api/v1/reviews/batch/'
+
+    def test_batch_create_updates_ratings(self, user_client, catalog):
+        from reviews.models import Title
+
+        titles = catalog['titles'][6:9]
+        response = user_client.post(self.url, [
+            {'title': title.id, 'text': 'Отлично', 'score': 8}
+            for title in titles
+        ], format='json')
+        assert response.status_code == 201
+        assert {review['author'] for review in response.json()} == {
+            'TestUser'
+        }
+        for title in Title.objects.filter(pk__in=[t.id for t in titles]):
+            assert (title.rating, title.reviews_count) == (8, 1)
+
+    def test_duplicates_and_missing_titles(self, user_client, catalog):
+        from reviews.models import Review
+
+        title = catalog['titles'][6]
+        user_client.post(self.url, [
+            {'title': title.id, 'text': 'Первый', 'score': 5}
+        ], format='json')
+        before = Review.objects.count()
+        response = user_client.post(self.url, [
+            {'title': catalog['titles'][7].id, 'text': 'Ок', 'score': 5},
+            {'title': title.id, 'text': 'Повтор', 'score': 5},
+            {'title': 10 ** 6, 'text': 'Нет такого', 'score': 5},
+            {'title': catalog['titles'][7].id, 'text': 'Ещё', 'score': 11},
+        ], format='json')
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {}
+        assert set(errors[1]) == set(errors[2]) == {'title'}
+        assert set(errors[3]) == {'score'}
+        assert Review.objects.count() == before
+
+    def test_anonymous_forbidden(self, anon_client):
+        response = anon_client.post(self.url, [], format='json')
+        assert response.status_code == 401
@@ -0,0 +1,94 @@
+import pytest
+from api.db import check_connections
+from django.db import connection
+
+
+def test_persistent_connections_configured():
+    from api_yamdb import settings
+
+    database = settings.DATABASES['default']
+    assert database['CONN_MAX_AGE'] == 60
+    assert database['CONN_HEALTH_CHECKS'] is True
+    assert settings.DB_POOLER is False
+
+
+@pytest.mark.django_db(transaction=True)
+class TestHealthChecks:
+
+    def test_connected_to_request_started(self):
+        from django.core.signals import request_started
+
+        assert check_connections in [
+            receiver() for _, receiver in request_started.receivers
+        ]
+
+    @pytest.fixture
+    def checks(self, monkeypatch):
+        """Включает проверки и считает вызовы is_usable и close."""
+        calls = {'checks': 0, 'closed': 0, 'usable': True}
+
+        def is_usable():
+            calls['checks'] += 1
+            return calls['usable']
+
+        def close():
+            calls['closed'] += 1
+
+        connection.ensure_connection()
+        monkeypatch.setitem(connection.settings_dict, 'CONN_HEALTH_CHECKS', True)
+        monkeypatch.setattr(connection, 'is_usable', is_usable)
+        monkeypatch.setattr(connection, 'close', close)
+        return calls
+
+    def test_broken_connection_is_closed(self, checks):
+        checks['usable'] = False
+        check_connections()
+        assert checks['closed'] == 0
+        connection.cursor().close()
+        assert checks == {'checks': 1, 'closed': 1, 'usable': False}
+
+    def test_checked_once_per_request(self, checks):
+        check_connections()
+        connection.cursor().close()
+        connection.cursor().close()
+        assert (checks['checks'], checks['closed']) == (1, 0)
+        check_connections()
+        connection.cursor().close()
+        assert checks['checks'] == 2
+
+    def test_no_check_without_queries(self, checks):
+        check_connections()
+        check_connections()
+        assert checks['checks'] == 0
+
+    def test_disabled(self, checks, monkeypatch):
+        monkeypatch.setitem(connection.settings_dict, 'CONN_HEALTH_CHECKS', False)
+        checks['usable'] = False
+        check_connections()
+        connection.cursor().close()
+        assert checks['checks'] == checks['closed'] == 0
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPoolerMode:
+
+    def test_cursor_transaction(self, settings):
+        from api.db import cursor_transaction
+
+        settings.DB_POOLER = False
+        with cursor_transaction():
+            assert not connection.in_atomic_block
+        settings.DB_POOLER = True
+        with cursor_transaction():
+            assert connection.in_atomic_block
+
+    def test_export_reads_inside_transaction(self, settings, catalog):
+        from api.export import export_rows
+
+        settings.DB_POOLER = True
+        rows = export_rows('titles')
+        first = next(rows)
+        assert connection.in_atomic_block
+        assert first['genre']
+        assert len([first, *rows]) == len(catalog['titles'])
+        assert not connection.in_atomic_block
@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+
+import pytest
+
+
+def content(response):
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestExport:
+
+    def test_export_requires_admin(self, anon_client, user_client):
+        assert anon_client.get('/api/v1/export/reviews/').status_code == 401
+        assert user_client.get('/api/v1/export/reviews/').status_code == 403
+
+    def test_reviews_ndjson(self, admin_client, catalog,
+                            django_assert_num_queries):
+        from reviews.models import Review
+
+        with django_assert_num_queries(1):
+            response = admin_client.get('/api/v1/export/reviews/')
+            rows = [json.loads(line) for line in content(response).splitlines()]
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        assert len(rows) == Review.objects.count()
+        assert set(rows[0]) == {
+            'id', 'title', 'text', 'author', 'score', 'pub_date'
+        }
+        assert rows[0]['author'].startswith('author')
+
+    def test_since_filters_by_pub_date(self, admin_client, catalog):
+        from reviews.models import Comment
+
+        comments = list(Comment.objects.order_by('pub_date', 'id'))
+        since = comments[2].pub_date.isoformat()
+        response = admin_client.get(
+            '/api/v1/export/comments/', {'since': since}
+        )
+        ids = [json.loads(line)['id'] for line in content(response).splitlines()]
+        assert ids == [
+            comment.id for comment in comments
+            if comment.pub_date > comments[2].pub_date
+        ]
+        for since in ('вчера', '2020-13-01T00:00'):
+            response = admin_client.get(
+                '/api/v1/export/comments/', {'since': since}
+            )
+            assert response.status_code == 400, since
+            assert 'since' in response.json()
+
+    def test_titles_csv(self, admin_client, catalog):
+        response = admin_client.get(
+            '/api/v1/export/titles/', {'format': 'csv'}
+        )
+        assert response['Content-Type'].startswith('text/csv')
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        assert len(rows) == len(catalog['titles'])
+        title_id = str(catalog['titles'][1].id)
+        first = next(row for row in rows if row['id'] == title_id)
+        assert first['genre'] == 'comedy,drama'
+        assert first['category'] == 'movie'
+
+    @pytest.mark.parametrize('export_format', ('ndjson', 'csv'))
+    def test_errors_are_json(self, admin_client, user_client, export_format):
+        response = admin_client.get(
+            '/api/v1/export/users/', {'format': export_format}
+        )
+        assert response.status_code == 404
+        assert response['Content-Type'] == 'application/json'
+        assert 'detail' in response.json()
+        response = user_client.get(
+            '/api/v1/export/reviews/', {'format': export_format}
+        )
+        assert response.status_code == 403
+        assert response['Content-Type'] == 'application/json'
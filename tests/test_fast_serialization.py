@@ -0,0 +1,97 @@
+import pytest
+
+URLS = (
+    '/api/v1/titles/',
+    '/api/v1/titles/?page_size=100',
+    '/api/v1/titles/?cursor=&ordering=-rating',
+    '/api/v1/titles/?search=Произведение',
+    '/api/v1/titles/?genre=drama&fields=id,genre',
+    '/api/v1/titles/?omit=category',
+    '/api/v1/titles/{title}/reviews/?page_size=100',
+    '/api/v1/titles/{title}/reviews/?cursor=',
+    '/api/v1/titles/{title}/reviews/{review}/comments/',
+)
+
+
+@pytest.fixture
+def slow_path(monkeypatch):
+    """Обычный путь: сериализаторы DRF и JSONRenderer."""
+    from api.fast import FastListMixin
+    from api.renderers import FastJSONRenderer
+    from rest_framework.renderers import JSONRenderer
+
+    def disable():
+        monkeypatch.setattr(FastListMixin, 'get_read_plan', lambda self: None)
+        monkeypatch.setattr(
+            FastJSONRenderer, 'render', JSONRenderer.render
+        )
+    return disable
+
+
+@pytest.mark.django_db
+class TestFastSerialization:
+
+    @pytest.mark.parametrize('url', URLS)
+    def test_same_bytes(self, url, user_client, catalog, slow_path):
+        from reviews.models import Category, Title
+
+        title = catalog['titles'][0]
+        review = title.reviews.first()
+        # Произведение без категории и жанров.
+        Title.objects.create(name='Без категории', year=2000)
+        Category.objects.filter(slug='book').update(name='Кн\u2028ига')
+        url = url.format(title=title.id, review=review.id)
+        fast = user_client.get(url)
+        slow_path()
+        slow = user_client.get(url)
+        assert fast.status_code == slow.status_code == 200
+        assert fast.content == slow.content
+
+    def test_queries(self, user_client, catalog, django_assert_num_queries):
+        # COUNT, страница с категориями через JOIN и жанры страницы.
+        with django_assert_num_queries(3):
+            response = user_client.get('/api/v1/titles/')
+        assert response.status_code == 200
+
+    def test_unsupported_serializer(self, catalog):
+        from api.fast import PlanError, ReadPlan
+        from rest_framework import serializers
+        from reviews.models import Title
+
+        class TitleNameSerializer(serializers.ModelSerializer):
+            upper = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Title
+                fields = ('name', 'upper')
+
+        with pytest.raises(PlanError):
+            ReadPlan(TitleNameSerializer())
+
+
+class TestFastJSONRenderer:
+
+    def test_matches_json_renderer(self):
+        from datetime import datetime, timezone
+        from decimal import Decimal
+        from uuid import UUID
+
+        from api.renderers import FastJSONRenderer
+        from django.utils.translation import gettext_lazy
+        from rest_framework.renderers import JSONRenderer
+
+        data = {
+            'text': 'Отзыв \u2028 \u2029 "кавычки"',
+            'date': datetime(2026, 1, 2, 3, 4, 5, 678901, timezone.utc),
+            'decimal': Decimal('1.5'),
+            'uuid': UUID(int=1),
+            'lazy': gettext_lazy('Этот пароль'),
+            'numbers': [1, 2.5, None, True],
+            1: 'нестроковый ключ',
+        }
+        for accepted in (None, 'application/json; indent=4'):
+            assert FastJSONRenderer().render(data, accepted) == (
+                JSONRenderer().render(data, accepted)
+            )
+        del data[1]
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
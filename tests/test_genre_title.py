@@ -0,0 +1,87 @@
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class TestGenreTitleMigration:
+
+    def migrate(self, target=None):
+        from django.db import connection
+        from django.db.migrations.executor import MigrationExecutor
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        targets = (
+            [('reviews', target)] if target
+            else executor.loader.graph.leaf_nodes('reviews')
+        )
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    @pytest.fixture(autouse=True)
+    def latest_schema(self):
+        yield
+        self.migrate()
+
+    def test_merges_both_link_tables(self):
+        apps = self.migrate('0005_outgoing_email')
+        Genre = apps.get_model('reviews', 'Genre')
+        Title = apps.get_model('reviews', 'Title')
+        OldGenreTitle = apps.get_model('reviews', 'GenreTitle')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        first = Title.objects.create(name='Первое', year=2000)
+        second = Title.objects.create(name='Второе', year=2000)
+        first.genre.add(drama)
+        OldGenreTitle.objects.bulk_create([
+            OldGenreTitle(title_id=first, genre_id=drama),
+            OldGenreTitle(title_id=first, genre_id=comedy),
+            OldGenreTitle(title_id=second, genre_id=comedy),
+            OldGenreTitle(title_id=second, genre_id=comedy),
+        ])
+
+        self.migrate('0006_genre_title_through')
+
+        from reviews.models import GenreTitle, Title
+        assert sorted(
+            GenreTitle.objects.values_list('title__name', 'genre__slug')
+        ) == [
+            ('Второе', 'comedy'),
+            ('Первое', 'comedy'),
+            ('Первое', 'drama'),
+        ], 'Связи обеих таблиц должны быть объединены без повторов'
+        assert set(
+            Title.objects.filter(genre__slug='comedy')
+            .values_list('name', flat=True)
+        ) == {'Первое', 'Второе'}
+
+
+@pytest.mark.django_db
+class TestGenreTitleImport:
+
+    def test_imports_shipped_csv(self):
+        import os
+
+        import tablib
+        from django.core.management import call_command
+        from reviews.admin import GenreTitleResource
+        from reviews.management.commands.load_csv import DEFAULT_PATH
+        from reviews.models import GenreTitle
+
+        call_command('load_csv')
+        expected = sorted(
+            GenreTitle.objects.values_list('id', 'title_id', 'genre_id')
+        )
+        GenreTitle.objects.all().delete()
+        with open(os.path.join(DEFAULT_PATH, 'genre_title.csv'),
+                  encoding='utf-8') as file:
+            dataset = tablib.Dataset().load(file.read(), format='csv')
+
+        result = GenreTitleResource().import_data(dataset)
+
+        assert not result.has_errors(), [
+            error.error for row in result.row_errors() for error in row[1]
+        ]
+        assert sorted(
+            GenreTitle.objects.values_list('id', 'title_id', 'genre_id')
+        ) == expected
+        assert len(expected) == 42
@@ -0,0 +1,42 @@
+import multiprocessing
+import os
+import runpy
+
+from .conftest import root_dir
+
+CONFIG = os.path.join(root_dir, 'api_yamdb', 'gunicorn.conf.py')
+
+
+def load_config(monkeypatch, tmp_path, **env):
+    monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path / 'metrics'))
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return runpy.run_path(CONFIG)
+
+
+class TestGunicornConfig:
+
+    def test_defaults(self, monkeypatch, tmp_path):
+        config = load_config(monkeypatch, tmp_path)
+        assert config['worker_class'] == 'gthread'
+        assert config['workers'] == multiprocessing.cpu_count() * 2 + 1
+        assert config['preload_app'] is True
+        assert config['max_requests'] > 0
+        assert 0 < config['max_requests_jitter'] < config['max_requests']
+        assert config['graceful_timeout'] <= config['timeout']
+        assert os.path.isdir(tmp_path / 'metrics'), (
+            'Каталог метрик должен существовать до загрузки приложения'
+        )
+
+    def test_environment_overrides(self, monkeypatch, tmp_path):
+        config = load_config(
+            monkeypatch, tmp_path,
+            GUNICORN_WORKER_CLASS='sync',
+            GUNICORN_WORKERS='1',
+            GUNICORN_PRELOAD='false',
+            GUNICORN_MAX_REQUESTS='0',
+        )
+        assert config['worker_class'] == 'sync'
+        assert config['workers'] == 1
+        assert config['preload_app'] is False
+        assert config['max_requests'] == 0
@@ -0,0 +1,159 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+class TestLeaderboards:
+
+    def positions(self, client, url):
+        response = client.get(url)
+        assert response.status_code == 200, response.json()
+        return [
+            (entry['title']['id'], entry['value'])
+            for entry in response.json()
+        ]
+
+    def expected_top_rated(self, **filters):
+        from reviews.models import Title
+
+        return list(Title.objects.filter(
+            rating__isnull=False, **filters
+        ).order_by('-rating', '-reviews_count', '-id').values_list(
+            'id', 'rating'
+        ))
+
+    def test_boards_after_refresh(self, anon_client, catalog,
+                                  django_assert_num_queries):
+        call_command('update_leaderboards')
+        with django_assert_num_queries(1):
+            top = self.positions(
+                anon_client, '/api/v1/leaderboards/top_rated/'
+            )
+        assert top == self.expected_top_rated()
+        assert self.positions(
+            anon_client, '/api/v1/leaderboards/top_rated/?genre=drama'
+        ) == self.expected_top_rated(genre__slug='drama')
+        assert self.positions(
+            anon_client, '/api/v1/leaderboards/top_rated/?category=movie'
+            '&limit=2'
+        ) == self.expected_top_rated(category__slug='movie')[:2]
+        most_reviewed = self.positions(
+            anon_client, '/api/v1/leaderboards/most_reviewed/'
+        )
+        assert [value for _, value in most_reviewed] == [3] * 6
+        trending = self.positions(
+            anon_client, '/api/v1/leaderboards/trending/?genre=melodrama'
+        )
+        assert trending == [
+            (title.id, 3) for title in reversed(catalog['titles'][:6])
+            if title.id % 3 == 1
+        ]
+
+    def test_review_writes_refresh_incrementally(self, user_client,
+                                                 catalog):
+        from reviews.leaderboards import refresh_leaderboards
+        from reviews.models import Title
+
+        call_command('update_leaderboards')
+        assert not Title.objects.filter(leaderboards_stale=True).exists()
+        assert refresh_leaderboards() == 0
+
+        title = catalog['titles'][-1]
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/', {'text': 'Шедевр',
+                                                     'score': 10}
+        )
+        assert response.status_code == 201
+        # Раздел all, жанры drama и comedy, категория book
+        assert refresh_leaderboards() == 4
+        top = self.positions(
+            user_client, '/api/v1/leaderboards/top_rated/?genre=comedy'
+        )
+        assert top[0] == (title.id, 10)
+        trending = self.positions(
+            user_client, '/api/v1/leaderboards/trending/'
+        )
+        assert (title.id, 1) in trending
+
+    def test_genre_change_marks_title(self, admin_client, catalog):
+        from reviews.models import Title
+
+        call_command('update_leaderboards')
+        title = catalog['titles'][0]
+        response = admin_client.patch(
+            f'/api/v1/titles/{title.id}/', {'genre': ['comedy']},
+            format='json',
+        )
+        assert response.status_code == 200
+        assert list(
+            Title.objects.filter(leaderboards_stale=True)
+            .values_list('id', flat=True)
+        ) == [title.id]
+
+    def test_direct_genre_link_marks_title(self, catalog):
+        from reviews.models import GenreTitle, Title
+
+        call_command('update_leaderboards')
+        title = catalog['titles'][0]
+        link = GenreTitle.objects.create(
+            title=title, genre=catalog['genres'][1]
+        )
+        assert list(
+            Title.objects.filter(leaderboards_stale=True)
+            .values_list('id', flat=True)
+        ) == [title.id], 'Связь из админки или импорта без m2m_changed'
+
+        call_command('update_leaderboards')
+        link.delete()
+        assert list(
+            Title.objects.filter(leaderboards_stale=True)
+            .values_list('id', flat=True)
+        ) == [title.id]
+
+    def test_deleted_title_leaves_no_gap(self, admin_client, catalog):
+        from reviews.leaderboards import refresh_leaderboards
+        from reviews.models import LeaderboardEntry
+
+        call_command('update_leaderboards')
+        first = LeaderboardEntry.objects.get(
+            board='top_rated', scope='all', position=1
+        )
+        response = admin_client.delete(f'/api/v1/titles/{first.title_id}/')
+        assert response.status_code == 204
+        refresh_leaderboards()
+        positions = list(LeaderboardEntry.objects.filter(
+            board='top_rated', scope='all'
+        ).values_list('position', flat=True))
+        assert positions == list(range(1, len(positions) + 1))
+        assert len(positions) == 5
+
+    @pytest.mark.parametrize('full', (False, True))
+    def test_failed_refresh_keeps_flags(self, monkeypatch, catalog, full):
+        from reviews import leaderboards
+        from reviews.models import Title
+
+        stale = set(Title.objects.filter(
+            leaderboards_stale=True
+        ).values_list('id', flat=True))
+        assert stale
+
+        def fail():
+            raise RuntimeError('сбой пересчёта')
+
+        monkeypatch.setattr(leaderboards, 'trending_rankings', fail)
+        with pytest.raises(RuntimeError):
+            leaderboards.refresh_leaderboards(full=full)
+        assert set(Title.objects.filter(
+            leaderboards_stale=True
+        ).values_list('id', flat=True)) == stale
+
+    def test_invalid_parameters(self, anon_client, catalog):
+        assert anon_client.get(
+            '/api/v1/leaderboards/top_rated/?genre=drama&category=movie'
+        ).status_code == 400
+        assert anon_client.get(
+            '/api/v1/leaderboards/top_rated/?limit=0'
+        ).status_code == 400
+        assert anon_client.get(
+            '/api/v1/leaderboards/unknown/'
+        ).status_code == 404
@@ -0,0 +1,77 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+
+@pytest.mark.django_db
+class TestLoadCsv:
+
+    def counts(self):
+        from reviews.models import Category, Comment, Genre, Review, Title, User
+
+        return {
+            model.__name__: model.objects.count() for model in (
+                User, Category, Genre, Title, Title.genre.through,
+                Review, Comment,
+            )
+        }
+
+    def test_dry_run_writes_nothing(self):
+        before = self.counts()
+        call_command('load_csv', '--dry-run', batch_size=50)
+        assert self.counts() == before
+
+    def test_load_is_idempotent(self):
+        from reviews.models import Category, Review, Title
+
+        call_command('load_csv', batch_size=50)
+        loaded = self.counts()
+        assert all(loaded.values())
+
+        review = Review.objects.order_by('id').first()
+        assert review.pub_date.year < 2022
+        title = Title.objects.get(pk=review.title_id)
+        assert title.reviews_count == title.reviews.count()
+        assert title.genre.exists()
+
+        Category.objects.filter(pk=1).update(name='Изменено')
+        call_command('load_csv', batch_size=7)
+        assert self.counts() == loaded
+        assert Category.objects.get(pk=1).name == 'Фильм'
+
+        category = Category.objects.create(name='Подкасты', slug='podcast')
+        assert category.pk > max(
+            Category.objects.exclude(pk=category.pk)
+            .values_list('pk', flat=True)
+        )
+
+    def test_repeated_genre_pair_is_skipped(self, tmp_path):
+        from reviews.models import GenreTitle
+
+        call_command('load_csv', batch_size=50)
+        link = GenreTitle.objects.order_by('id').first()
+        count = GenreTitle.objects.count()
+        (tmp_path / 'genre_title.csv').write_text(
+            f'id,title_id,genre_id\n{count + 100},{link.title_id},'
+            f'{link.genre_id}\n',
+            encoding='utf-8',
+        )
+        call_command('load_csv', path=str(tmp_path))
+        assert GenreTitle.objects.count() == count
+
+    def test_invalid_rows_are_reported(self, tmp_path):
+        (tmp_path / 'category.csv').write_text(
+            'id,name,slug\n1,Фильм,movie\n2,Книга,not a slug\n',
+            encoding='utf-8',
+        )
+        (tmp_path / 'titles.csv').write_text(
+            'id,name,year,category\n1,Название,1994,42\n',
+            encoding='utf-8',
+        )
+        with pytest.raises(CommandError, match='строка 3'):
+            call_command('load_csv', '--dry-run', path=str(tmp_path))
+
+        (tmp_path / 'category.csv').write_text(
+            'id,name,slug\n1,Фильм,movie\n', encoding='utf-8',
+        )
+        with pytest.raises(CommandError, match='id=42'):
+            call_command('load_csv', '--dry-run', path=str(tmp_path))
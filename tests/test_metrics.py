@@ -0,0 +1,78 @@
+import pytest
+from prometheus_client.parser import text_string_to_metric_families
+
+
+def read_metrics(client):
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/plain')
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for family in text_string_to_metric_families(
+            response.content.decode()
+        )
+        for sample in family.samples
+    }
+
+
+def value(metrics, name, **labels):
+    return metrics.get((name, tuple(sorted(labels.items()))), 0)
+
+
+@pytest.mark.django_db
+class TestMetrics:
+
+    def test_request_metrics(self, anon_client, catalog):
+        before = read_metrics(anon_client)
+        assert anon_client.get('/api/v1/titles/').status_code == 200
+        assert anon_client.get('/api/v1/titles/').status_code == 200
+        assert anon_client.get('/api/v1/titles/0/').status_code == 404
+        after = read_metrics(anon_client)
+
+        def delta(name, **labels):
+            return value(after, name, **labels) - value(
+                before, name, **labels
+            )
+
+        assert delta(
+            'yamdb_http_requests_total',
+            view='titles-list', method='GET', status='200',
+        ) == 2
+        assert delta(
+            'yamdb_http_requests_total',
+            view='titles-detail', method='GET', status='404',
+        ) == 1
+        assert delta(
+            'yamdb_http_request_duration_seconds_count',
+            view='titles-list', method='GET',
+        ) == 2
+        assert delta(
+            'yamdb_db_queries_per_request_count', view='titles-list'
+        ) == 2
+        assert delta(
+            'yamdb_db_queries_per_request_sum', view='titles-list'
+        ) > 0
+        # Промах — первый список и несуществующее произведение.
+        assert delta(
+            'yamdb_cache_requests_total', cache='response', result='miss'
+        ) == 2
+        assert delta(
+            'yamdb_cache_requests_total', cache='response', result='hit'
+        ) == 1
+        assert value(after, 'yamdb_workers') == 1
+
+    def test_user_cache_metrics(self, anon_client, user):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        before = read_metrics(anon_client)
+        anon_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+        )
+        anon_client.get('/api/v1/users/me/')
+        anon_client.get('/api/v1/users/me/')
+        after = read_metrics(anon_client)
+        for result in ('miss', 'hit'):
+            labels = {'cache': 'user', 'result': result}
+            assert value(
+                after, 'yamdb_cache_requests_total', **labels
+            ) - value(before, 'yamdb_cache_requests_total', **labels) == 1
@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+
+class FailingBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise ConnectionRefusedError('SMTP недоступен')
+
+
+class LeaseCheckingBackend(BaseEmailBackend):
+    """Запоминает строку письма в момент отправки."""
+    seen = []
+
+    def send_messages(self, email_messages):
+        from reviews.models import OutgoingEmail
+
+        self.seen.append(OutgoingEmail.objects.values(
+            'attempts', 'send_after', 'sent_at'
+        ).get())
+        return len(email_messages)
+
+
+@pytest.mark.django_db
+class TestOutbox:
+
+    def signup(self, anon_client):
+        response = anon_client.post('/api/v1/auth/signup/', {
+            'username': 'newbie', 'email': 'newbie@yamdb.fake',
+        })
+        assert response.status_code == 200
+
+    def test_signup_enqueues_email(self, anon_client):
+        from reviews.models import OutgoingEmail
+
+        self.signup(anon_client)
+        assert mail.outbox == []
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == 'newbie@yamdb.fake'
+        assert email.sent_at is None
+
+        call_command('send_outbox')
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == ['newbie@yamdb.fake']
+        email.refresh_from_db()
+        assert email.sent_at is not None
+        assert email.attempts == 1
+
+        call_command('send_outbox')
+        assert len(mail.outbox) == 1
+
+    def test_failed_email_is_retried_later(self, anon_client, settings):
+        from reviews.models import OutgoingEmail
+
+        settings.EMAIL_BACKEND = 'tests.test_outbox.FailingBackend'
+        self.signup(anon_client)
+        call_command('send_outbox')
+        email = OutgoingEmail.objects.get()
+        assert email.sent_at is None
+        assert email.attempts == 1
+        assert 'SMTP' in email.last_error
+        assert email.send_after > timezone.now() + timedelta(seconds=30)
+
+        call_command('send_outbox')
+        email.refresh_from_db()
+        assert email.attempts == 1
+
+    def test_gives_up_after_max_attempts(self, anon_client, settings):
+        from reviews.models import OutgoingEmail
+
+        settings.EMAIL_BACKEND = 'tests.test_outbox.FailingBackend'
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 1
+        self.signup(anon_client)
+        call_command('send_outbox')
+        OutgoingEmail.objects.update(send_after=timezone.now())
+        call_command('send_outbox')
+        assert OutgoingEmail.objects.get().attempts == 1
+
+    def test_email_is_leased_before_sending(self, anon_client, settings):
+        from reviews.models import OutgoingEmail
+
+        settings.EMAIL_BACKEND = 'tests.test_outbox.LeaseCheckingBackend'
+        LeaseCheckingBackend.seen = []
+        self.signup(anon_client)
+        call_command('send_outbox')
+        [row] = LeaseCheckingBackend.seen
+        assert row['attempts'] == 1
+        assert row['sent_at'] is None
+        assert row['send_after'] > timezone.now() + timedelta(
+            seconds=settings.EMAIL_OUTBOX_LEASE - 30
+        ), 'Письмо должно быть в аренде, пока идёт отправка'
+        assert OutgoingEmail.objects.get().sent_at is not None
+
+    def test_loop_reopens_stale_connections(self, monkeypatch):
+        from reviews.management.commands import send_outbox
+
+        calls = []
+
+        def sleep(seconds):
+            if calls:
+                raise KeyboardInterrupt
+        monkeypatch.setattr(send_outbox.time, 'sleep', sleep)
+        monkeypatch.setattr(
+            send_outbox, 'close_old_connections', lambda: calls.append(1)
+        )
+        with pytest.raises(KeyboardInterrupt):
+            call_command('send_outbox', '--loop')
+        assert calls == [1]
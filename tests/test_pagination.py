@@ -0,0 +1,71 @@
+import pytest
+
+
+@pytest.fixture
+def many_reviews(catalog, django_user_model):
+    from reviews.models import Review
+
+    title = catalog['titles'][-1]
+    for i in range(23):
+        author = django_user_model.objects.create_user(
+            username=f'reader{i}', email=f'reader{i}@yamdb.fake'
+        )
+        Review.objects.create(
+            title=title, author=author, text=f'Отзыв {i}', score=i % 10 + 1
+        )
+    return title
+
+
+@pytest.mark.django_db
+class TestPagination:
+
+    def test_page_number_pagination_is_default(self, anon_client, catalog):
+        response = anon_client.get('/api/v1/titles/')
+        data = response.json()
+        assert data['count'] == len(catalog['titles'])
+        assert len(data['results']) == 5
+
+    def test_page_size_is_capped(self, anon_client, catalog):
+        from api.pagination import MAX_PAGE_SIZE
+
+        response = anon_client.get('/api/v1/titles/?page_size=2')
+        assert len(response.json()['results']) == 2
+        response = anon_client.get(
+            f'/api/v1/titles/?page_size={MAX_PAGE_SIZE + 1}'
+        )
+        assert len(response.json()['results']) == len(catalog['titles'])
+
+    def test_cursor_walks_all_reviews(self, anon_client, many_reviews):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        url = (f'/api/v1/titles/{many_reviews.id}/reviews/'
+               f'?cursor=&page_size=10')
+        seen = []
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                response = anon_client.get(url)
+            assert response.status_code == 200
+            assert not any(
+                'COUNT(' in query['sql'] or 'OFFSET' in query['sql']
+                for query in context.captured_queries
+            )
+            data = response.json()
+            assert 'count' not in data
+            seen.extend(review['id'] for review in data['results'])
+            url = data['next']
+        assert len(seen) == len(set(seen)) == 23
+        dates = list(
+            many_reviews.reviews.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+        assert seen == dates
+
+    def test_cursor_on_titles(self, anon_client, catalog):
+        response = anon_client.get('/api/v1/titles/?cursor=&page_size=5')
+        data = response.json()
+        ids = [title['id'] for title in data['results']]
+        assert ids == sorted(ids, reverse=True)
+        next_page = anon_client.get(data['next']).json()
+        assert next_page['results'][0]['id'] < ids[-1]
+        assert next_page['previous']
@@ -0,0 +1,61 @@
+import json
+import logging
+
+import pytest
+
+
+@pytest.fixture
+def profiling(settings):
+    from api import profiling
+
+    settings.REQUEST_PROFILING = True
+    settings.REQUEST_PROFILING_SAMPLE_RATE = 1
+    profiling.samples.clear()
+    yield profiling
+    profiling.samples.clear()
+
+
+@pytest.mark.django_db
+class TestProfilingMiddleware:
+
+    def test_disabled_by_default(self, user_client, catalog):
+        response = user_client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert 'Server-Timing' not in response
+
+    def test_server_timing_and_log(
+        self, profiling, user_client, catalog, caplog
+    ):
+        with caplog.at_level(logging.INFO, logger='api.profiling'):
+            response = user_client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        timing = response['Server-Timing']
+        assert 'db;dur=' in timing
+        assert 'serializer;dur=' in timing
+        assert 'total;dur=' in timing
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record['path'] == '/api/v1/titles/'
+        assert record['status'] == 200
+        assert record['queries'] > 0
+        assert f'desc="{record["queries"]} queries"' in timing
+        assert record['serializer_ms'] > 0
+        slowest = record['slowest_queries']
+        assert 0 < len(slowest) <= 5
+        assert slowest == sorted(slowest, key=lambda q: -q['ms'])
+
+    def test_samples_endpoint(self, profiling, admin_client, user_client):
+        user_client.get('/api/v1/categories/')
+        user_client.get('/api/v1/genres/')
+        assert user_client.get('/api/v1/profiling/').status_code == 403
+        response = admin_client.get('/api/v1/profiling/')
+        assert response.status_code == 200
+        paths = [sample['path'] for sample in response.json()]
+        assert paths[:3] == [
+            '/api/v1/profiling/', '/api/v1/genres/', '/api/v1/categories/',
+        ]
+
+    def test_sample_rate(self, profiling, settings, user_client):
+        settings.REQUEST_PROFILING_SAMPLE_RATE = 0
+        response = user_client.get('/api/v1/categories/')
+        assert 'Server-Timing' in response
+        assert not profiling.samples
@@ -0,0 +1,85 @@
+import pytest
+
+DATABASES = ['default', 'replica']
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ['replica']
+
+
+@pytest.fixture
+def replica_category():
+    """Категория, которая есть только на реплике."""
+    from reviews.models import Category
+
+    return Category.objects.using('replica').create(
+        name='С реплики', slug='replica'
+    )
+
+
+def slugs(response):
+    assert response.status_code == 200
+    return [category['slug'] for category in response.json()['results']]
+
+
+@pytest.mark.django_db(databases=DATABASES)
+class TestReplicaRouting:
+
+    def test_reads_go_to_replica(self, replicas, user_client, replica_category):
+        from reviews.models import Category
+
+        Category.objects.create(name='С primary', slug='primary')
+        assert slugs(user_client.get('/api/v1/categories/')) == ['replica']
+
+    def test_without_replicas_reads_primary(
+        self, user_client, replica_category
+    ):
+        assert slugs(user_client.get('/api/v1/categories/')) == []
+
+    def test_other_endpoints_read_primary(
+        self, replicas, admin_client, replica_category
+    ):
+        response = admin_client.get('/api/v1/users/')
+        assert response.status_code == 200
+        assert response.json()['count'] == 1
+
+    def test_writes_go_to_primary(self, replicas, admin_client):
+        from reviews.models import Category
+
+        response = admin_client.post(
+            '/api/v1/categories/', {'name': 'Новая', 'slug': 'new'}
+        )
+        assert response.status_code == 201
+        assert Category.objects.filter(slug='new').exists()
+        assert not Category.objects.using('replica').exists()
+
+    def test_user_reads_own_writes(
+        self, replicas, admin_client, user_client, replica_category
+    ):
+        response = admin_client.post(
+            '/api/v1/categories/', {'name': 'Новая', 'slug': 'new'}
+        )
+        assert response.status_code == 201
+        assert slugs(admin_client.get('/api/v1/categories/')) == ['new']
+        # Другой пользователь не закреплён и читает реплику.
+        assert slugs(user_client.get('/api/v1/categories/')) == ['replica']
+
+    def test_pin_expires(self, replicas, settings, admin_client,
+                         replica_category):
+        settings.REPLICA_PIN_SECONDS = 0
+        admin_client.post(
+            '/api/v1/categories/', {'name': 'Новая', 'slug': 'new'}
+        )
+        assert slugs(admin_client.get('/api/v1/categories/')) == ['replica']
+
+    def test_changed_resource_reads_primary(
+        self, replicas, anon_client, replica_category,
+        django_capture_on_commit_callbacks,
+    ):
+        from reviews.models import Category
+
+        assert slugs(anon_client.get('/api/v1/categories/')) == ['replica']
+        with django_capture_on_commit_callbacks(execute=True):
+            Category.objects.create(name='С primary', slug='primary')
+        assert slugs(anon_client.get('/api/v1/categories/')) == ['primary']
@@ -0,0 +1,98 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+
+    def test_anonymous_list_is_served_from_cache(
+        self, anon_client, catalog, django_assert_num_queries
+    ):
+        first = anon_client.get('/api/v1/titles/?page=2')
+        assert first.status_code == 200
+        with django_assert_num_queries(0):
+            second = anon_client.get('/api/v1/titles/?page=2')
+        assert second.json() == first.json()
+        assert second['ETag'] == first['ETag']
+        other = anon_client.get('/api/v1/titles/?page=1')
+        assert other.json() != first.json()
+
+    def test_etag_revalidation(self, anon_client, catalog,
+                               django_assert_num_queries):
+        etag = anon_client.get('/api/v1/genres/')['ETag']
+        with django_assert_num_queries(0):
+            response = anon_client.get(
+                '/api/v1/genres/', HTTP_IF_NONE_MATCH=etag
+            )
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+
+    def test_writes_invalidate_cache(self, anon_client, admin_client,
+                                     catalog,
+                                     django_capture_on_commit_callbacks):
+        etag = anon_client.get('/api/v1/categories/')['ETag']
+        titles_etag = anon_client.get('/api/v1/titles/')['ETag']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = admin_client.post(
+                '/api/v1/categories/', {'name': 'Музыка', 'slug': 'music'}
+            )
+        assert response.status_code == 201
+
+        response = anon_client.get(
+            '/api/v1/categories/', HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == 200
+        assert 'music' in {
+            category['slug'] for category in response.json()['results']
+        }
+        response = anon_client.get(
+            '/api/v1/titles/', HTTP_IF_NONE_MATCH=titles_etag
+        )
+        assert response.status_code == 200
+
+    def test_review_changes_invalidate_titles(
+        self, anon_client, user_client, catalog,
+        django_capture_on_commit_callbacks
+    ):
+        title = catalog['titles'][-1]
+        url = f'/api/v1/titles/{title.id}/'
+        assert anon_client.get(url).json()['rating'] is None
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user_client.post(f'{url}reviews/', {'text': 'Отзыв', 'score': 9})
+        assert anon_client.get(url).json()['rating'] == 9
+
+    def test_genre_links_invalidate_titles(
+        self, anon_client, catalog, django_capture_on_commit_callbacks
+    ):
+        from reviews.models import GenreTitle
+
+        title = catalog['titles'][-1]
+        url = f'/api/v1/titles/{title.id}/'
+        genres = {genre['slug'] for genre in anon_client.get(url).json()[
+            'genre'
+        ]}
+        genre = next(
+            genre for genre in catalog['genres'] if genre.slug not in genres
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            GenreTitle.objects.create(title=title, genre=genre)
+        assert genre.slug in {
+            item['slug'] for item in anon_client.get(url).json()['genre']
+        }
+
+    def test_disabled_without_shared_backend(
+        self, anon_client, settings, catalog, django_assert_num_queries
+    ):
+        settings.RESPONSE_CACHE_ENABLED = False
+        anon_client.get('/api/v1/genres/')
+        with django_assert_num_queries(2):
+            response = anon_client.get('/api/v1/genres/')
+        assert response.status_code == 200
+        assert not response.has_header('ETag')
+
+    def test_authenticated_requests_bypass_cache(self, user_client, catalog):
+        response = user_client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert not response.has_header('ETag')
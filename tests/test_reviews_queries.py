@@ -0,0 +1,80 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestReviewsQueries:
+
+    def first_review(self, catalog):
+        return catalog['titles'][0].reviews.select_related('author').first()
+
+    def add_comments(self, review, authors):
+        from reviews.models import Comment
+
+        Comment.objects.bulk_create([
+            Comment(review=review, author=author, text=f'Ещё {author}')
+            for author in authors
+        ])
+
+    @pytest.mark.parametrize('page_size', [1, 3])
+    def test_reviews_list_query_count(self, anon_client, catalog,
+                                      django_assert_num_queries, monkeypatch,
+                                      page_size):
+        monkeypatch.setattr(
+            'rest_framework.pagination.PageNumberPagination.page_size',
+            page_size,
+        )
+        title = catalog['titles'][0]
+        # Число отзывов вместе с проверкой произведения, страница с авторами
+        with django_assert_num_queries(2):
+            response = anon_client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response.status_code == 200
+        data = response.json()
+        assert data['count'] == 3
+        assert len(data['results']) == page_size
+        assert all(review['author'] for review in data['results'])
+
+    def test_comments_list_query_count(self, anon_client, catalog, admin,
+                                       user, django_assert_num_queries):
+        review = self.first_review(catalog)
+        self.add_comments(review, [admin, user])
+        with django_assert_num_queries(2):
+            response = anon_client.get(
+                f'/api/v1/titles/{review.title_id}/reviews/{review.id}'
+                '/comments/'
+            )
+        assert response.status_code == 200
+        data = response.json()
+        assert data['count'] == 3
+        assert {comment['author'] for comment in data['results']} >= {
+            admin.username, user.username
+        }
+
+    def test_empty_page_and_missing_parent(self, anon_client, catalog,
+                                           django_assert_num_queries):
+        empty = catalog['titles'][-1]
+        with django_assert_num_queries(1):
+            response = anon_client.get(f'/api/v1/titles/{empty.id}/reviews/')
+        assert response.status_code == 200
+        assert response.json()['results'] == []
+        with django_assert_num_queries(1):
+            response = anon_client.get('/api/v1/titles/100500/reviews/')
+        assert response.status_code == 404
+
+    def test_comments_of_review_from_another_title(self, anon_client,
+                                                   catalog):
+        review = self.first_review(catalog)
+        other = catalog['titles'][-1]
+        url = f'/api/v1/titles/{other.id}/reviews/{review.id}/comments/'
+        assert anon_client.get(url).status_code == 404
+        comment = review.comments.first()
+        assert anon_client.get(f'{url}{comment.id}/').status_code == 404
+
+    def test_detail_query_count(self, anon_client, catalog,
+                                django_assert_num_queries):
+        review = self.first_review(catalog)
+        with django_assert_num_queries(1):
+            response = anon_client.get(
+                f'/api/v1/titles/{review.title_id}/reviews/{review.id}/'
+            )
+        assert response.status_code == 200
+        assert response.json()['author'] == review.author.username
@@ -0,0 +1,121 @@
+import pytest
+
+
+@pytest.fixture
+def library(catalog, django_user_model):
+    from reviews.models import Review, Title
+
+    drama, comedy, _ = catalog['genres']
+    shawshank = Title.objects.create(
+        name='Побег из Шоушенка', year=1994,
+        description='Тюремная драма о надежде',
+        category=catalog['categories'][0],
+    )
+    shawshank.genre.set([drama, comedy])
+    godfather = Title.objects.create(
+        name='Крестный отец', year=1972,
+        description='Семейная сага, в которой есть побег',
+        category=catalog['categories'][0],
+    )
+    godfather.genre.set([drama, comedy])
+    author = django_user_model.objects.create_user(
+        username='critic', email='critic@yamdb.fake'
+    )
+    Review.objects.create(
+        title=catalog['titles'][0], author=author, score=5,
+        text='Напомнило мне Шоушенка',
+    )
+    return {'shawshank': shawshank, 'godfather': godfather}
+
+
+@pytest.mark.django_db
+class TestTitleSearch:
+
+    def search(self, client, query, **params):
+        response = client.get(
+            '/api/v1/titles/', {'search': query, 'page_size': 100, **params}
+        )
+        assert response.status_code == 200
+        return [title['id'] for title in response.json()['results']]
+
+    def test_search_ranks_and_has_no_duplicates(self, anon_client, library):
+        found = self.search(anon_client, 'побег')
+        assert found == [library['shawshank'].id, library['godfather'].id]
+
+    def test_search_matches_descriptions_and_reviews(self, anon_client,
+                                                     library, catalog):
+        found = self.search(anon_client, 'шоушенка')
+        assert len(found) == len(set(found)) == 2
+        assert set(found) == {
+            library['shawshank'].id, catalog['titles'][0].id
+        }
+        assert found[0] == library['shawshank'].id
+        assert self.search(anon_client, 'сага') == [library['godfather'].id]
+
+    def test_search_respects_explicit_ordering(self, anon_client, library):
+        found = self.search(anon_client, 'побег', ordering='year')
+        assert found == [library['godfather'].id, library['shawshank'].id]
+
+    def test_search_index_follows_updates(self, anon_client, library):
+        title = library['godfather']
+        title.description = 'Семейная сага'
+        title.save()
+        assert self.search(anon_client, 'побег') == [
+            library['shawshank'].id
+        ]
+        title.delete()
+        assert self.search(anon_client, 'сага') == []
+
+
+def update_triggers():
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' "
+            "AND name LIKE '%_fts_update'"
+        )
+        return dict(cursor.fetchall())
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSearchTriggers:
+
+    @pytest.fixture(autouse=True)
+    def sqlite_only(self):
+        from django.db import connection
+
+        if connection.vendor != 'sqlite':
+            pytest.skip('Триггеры FTS5 есть только на SQLite')
+
+    def migrate(self, target=None):
+        """Миграции reviews до target, без него — до последней."""
+        from django.db import connection
+        from django.db.migrations.executor import MigrationExecutor
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(
+            [('reviews', target)] if target
+            else executor.loader.graph.leaf_nodes('reviews')
+        )
+
+    def test_only_text_columns_reindex(self):
+        self.migrate()
+        triggers = update_triggers()
+        assert 'UPDATE OF name, description ON reviews_title WHEN' in (
+            triggers['reviews_title_fts_update']
+        )
+        assert 'UPDATE OF text ON reviews_review WHEN' in (
+            triggers['reviews_review_fts_update']
+        )
+
+    def test_migration_is_reversible(self):
+        self.migrate('0008_leaderboards')
+        try:
+            assert all(
+                'UPDATE OF' not in sql for sql in update_triggers().values()
+            )
+        finally:
+            self.migrate()
+        assert all('UPDATE OF' in sql for sql in update_triggers().values())
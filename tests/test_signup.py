@@ -0,0 +1,76 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+URL = '/api/v1/auth/signup/'
+
+
+@pytest.mark.django_db
+class TestSignup:
+
+    def user_queries(self, context):
+        return [
+            query['sql'] for query in context.captured_queries
+            if '"reviews_user"' in query['sql']
+        ]
+
+    def test_new_user_queries(self, anon_client):
+        from reviews.models import User
+
+        data = {'username': 'newbie', 'email': 'newbie@yamdb.fake'}
+        with CaptureQueriesContext(connection) as context:
+            response = anon_client.post(URL, data)
+        assert response.status_code == 200
+        assert response.json() == data
+        queries = self.user_queries(context)
+        assert len(queries) == 2
+        assert queries[0].startswith('SELECT')
+        assert queries[1].startswith('INSERT')
+        assert User.objects.filter(**data).exists()
+
+    def test_repeated_signup_single_query(self, anon_client, user):
+        data = {'username': user.username, 'email': user.email}
+        with CaptureQueriesContext(connection) as context:
+            response = anon_client.post(URL, data)
+        assert response.status_code == 200
+        assert len(self.user_queries(context)) == 1
+
+    @pytest.mark.parametrize('data, message', [
+        (
+            {'username': 'TestUser', 'email': 'other@yamdb.fake'},
+            'Другой пользователь с таким username уже существует.',
+        ),
+        (
+            {'username': 'other', 'email': 'user@yamdb.fake'},
+            'Другой пользователь с таким email уже существует.',
+        ),
+        (
+            {'username': 'me', 'email': 'me@yamdb.fake'},
+            'Нельзя использовать "me" в качестве имени пользователя.',
+        ),
+    ])
+    def test_conflicts(self, anon_client, user, data, message):
+        user.email = 'user@yamdb.fake'
+        user.save()
+        response = anon_client.post(URL, data)
+        assert response.status_code == 400
+        assert response.json() == {'non_field_errors': [message]}
+
+    def test_concurrent_signup(self):
+        from api.serializers import RegistrationSerializer
+        from rest_framework.exceptions import ValidationError
+
+        data = {'username': 'racer', 'email': 'racer@yamdb.fake'}
+        first = RegistrationSerializer(data=data)
+        same = RegistrationSerializer(data=data)
+        other = RegistrationSerializer(
+            data={'username': 'racer', 'email': 'other@yamdb.fake'}
+        )
+        assert first.is_valid() and same.is_valid() and other.is_valid()
+        user = first.save()
+        assert same.save() == user
+        with pytest.raises(ValidationError) as error:
+            other.save()
+        assert error.value.detail == {'non_field_errors': [
+            'Другой пользователь с таким username уже существует.'
+        ]}
@@ -0,0 +1,120 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestSparseFields:
+
+    def test_titles_fields(self, anon_client, catalog,
+                           django_assert_num_queries):
+        # COUNT и страница без категорий и жанров
+        with django_assert_num_queries(2) as context:
+            response = anon_client.get(
+                '/api/v1/titles/?fields=id,name,rating'
+            )
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert [set(title) for title in results] == [
+            {'id', 'name', 'rating'}
+        ] * len(results)
+        page_sql = context.captured_queries[-1]['sql']
+        assert 'description' not in page_sql
+        assert 'reviews_category' not in page_sql
+
+    def test_titles_omit(self, anon_client, catalog,
+                         django_assert_num_queries):
+        with django_assert_num_queries(2):
+            response = anon_client.get('/api/v1/titles/?omit=genre,category')
+        assert response.status_code == 200
+        title = response.json()['results'][0]
+        assert set(title) == {'id', 'name', 'year', 'description', 'rating'}
+
+    def test_nested_serializers_stay_whole(self, anon_client, catalog):
+        title = catalog['titles'][1]
+        response = anon_client.get(
+            f'/api/v1/titles/{title.id}/?fields=category,genre'
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data['category'] == {'name': 'Фильм', 'slug': 'movie'}
+        assert all(set(genre) == {'name', 'slug'} for genre in data['genre'])
+
+    def test_reviews_without_author(self, anon_client, catalog,
+                                    django_assert_num_queries):
+        title = catalog['titles'][0]
+        with django_assert_num_queries(2) as context:
+            response = anon_client.get(
+                f'/api/v1/titles/{title.id}/reviews/?fields=id,score'
+            )
+        assert response.status_code == 200
+        assert all(
+            set(review) == {'id', 'score'}
+            for review in response.json()['results']
+        )
+        assert 'reviews_user' not in context.captured_queries[-1]['sql']
+
+    def test_cursor_pagination_with_deferred_ordering(self, anon_client,
+                                                      catalog):
+        response = anon_client.get(
+            '/api/v1/titles/?cursor=&ordering=year&fields=name&page_size=5'
+        )
+        assert response.status_code == 200
+        data = response.json()
+        names = [title['name'] for title in data['results']]
+        data = anon_client.get(data['next']).json()
+        names += [title['name'] for title in data['results']]
+        assert names == [f'Произведение {i}' for i in range(10)]
+
+    def test_unknown_fields(self, anon_client, catalog):
+        response = anon_client.get('/api/v1/titles/?fields=id,nope&omit=x')
+        assert response.status_code == 400
+        assert set(response.json()) == {'fields', 'omit'}
+
+    def test_writes_ignore_selection(self, admin_client, catalog):
+        response = admin_client.post('/api/v1/categories/?fields=slug', {
+            'name': 'Сериал', 'slug': 'series'
+        })
+        assert response.status_code == 201
+        assert response.json() == {'name': 'Сериал', 'slug': 'series'}
+
+    def test_expand_with_fields(self, anon_client, catalog,
+                                django_assert_max_num_queries):
+        title = catalog['titles'][1]
+        url = f'/api/v1/titles/{title.id}/?expand=reviews'
+        with django_assert_max_num_queries(3):
+            response = anon_client.get(f'{url}&fields=id,reviews')
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data) == {'id', 'reviews'}
+        assert data['reviews']['count'] == 3
+        # Отзывы раздела не сужаются полями произведения.
+        assert all(
+            set(review) == {'id', 'text', 'author', 'score', 'pub_date'}
+            for review in data['reviews']['recent']
+        )
+
+        response = anon_client.get(f'{url}&fields=id')
+        assert response.json() == {'id': title.id}
+
+        response = anon_client.get(f'{url}&omit=description')
+        assert response.status_code == 200
+        data = response.json()
+        assert 'description' not in data
+        assert len(data['reviews']['recent']) == 3
+
+    def test_reviews_not_selectable_without_expand(self, anon_client,
+                                                   catalog):
+        title = catalog['titles'][1]
+        response = anon_client.get(
+            f'/api/v1/titles/{title.id}/?fields=id,reviews'
+        )
+        assert response.status_code == 400
+
+    def test_leaderboard_fields(self, anon_client, catalog):
+        from reviews.leaderboards import refresh_leaderboards
+
+        refresh_leaderboards(full=True)
+        response = anon_client.get(
+            '/api/v1/leaderboards/top_rated/?fields=position'
+        )
+        assert response.status_code == 200
+        assert response.json()[0] == {'position': 1}
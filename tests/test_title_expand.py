@@ -0,0 +1,68 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestTitleExpand:
+
+    def test_detail_without_expand(self, anon_client, catalog):
+        title = catalog['titles'][0]
+        response = anon_client.get(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == 200
+        assert 'reviews' not in response.json()
+
+    def test_reviews_summary(self, anon_client, catalog,
+                             django_assert_num_queries):
+        from reviews.models import Review
+
+        title = catalog['titles'][1]
+        reviews = list(
+            Review.objects.filter(title=title).order_by('-pub_date', '-id')
+        )
+        # Произведение, жанры, последние отзывы с авторами
+        with django_assert_num_queries(3):
+            response = anon_client.get(
+                f'/api/v1/titles/{title.id}/?expand=reviews'
+            )
+        assert response.status_code == 200
+        summary = response.json()['reviews']
+        assert summary['count'] == len(reviews)
+        expected = {str(score): 0 for score in range(1, 11)}
+        for review in reviews:
+            expected[str(review.score)] += 1
+        assert summary['scores'] == expected
+        assert [review['id'] for review in summary['recent']] == [
+            review.id for review in reviews
+        ]
+        assert summary['recent'][0]['author'] == reviews[0].author.username
+
+    def test_summary_follows_review_writes(self, user_client, catalog):
+        title = catalog['titles'][-1]
+        url = f'/api/v1/titles/{title.id}/'
+
+        response = user_client.post(
+            f'{url}reviews/', {'text': 'Отзыв', 'score': 7}
+        )
+        assert response.status_code == 201
+        review_id = response.json()['id']
+        summary = user_client.get(f'{url}?expand=reviews').json()['reviews']
+        assert summary['count'] == 1
+        assert summary['scores']['7'] == 1
+        assert summary['recent'][0]['id'] == review_id
+
+        user_client.patch(f'{url}reviews/{review_id}/', {'score': 3})
+        scores = user_client.get(
+            f'{url}?expand=reviews'
+        ).json()['reviews']['scores']
+        assert (scores['7'], scores['3']) == (0, 1)
+
+        user_client.delete(f'{url}reviews/{review_id}/')
+        summary = user_client.get(f'{url}?expand=reviews').json()['reviews']
+        assert summary['count'] == 0
+        assert not any(summary['scores'].values())
+        assert summary['recent'] == []
+
+    def test_unknown_expand(self, anon_client, catalog):
+        title = catalog['titles'][0]
+        response = anon_client.get(f'/api/v1/titles/{title.id}/?expand=foo')
+        assert response.status_code == 400
+        assert 'expand' in response.json()
@@ -0,0 +1,53 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestTitleFilter:
+
+    def titles(self, client, **params):
+        response = client.get('/api/v1/titles/', {'page_size': 100, **params})
+        assert response.status_code == 200
+        return [title['id'] for title in response.json()['results']]
+
+    def expected(self, titles, genres):
+        return {
+            title.id for title in titles
+            if genres & {genre.slug for genre in title.genre.all()}
+        }
+
+    def test_genre_is_exact_match(self, anon_client, catalog):
+        found = self.titles(anon_client, genre='drama')
+        assert set(found) == self.expected(catalog['titles'], {'drama'})
+        assert not set(found) & self.expected(
+            catalog['titles'], {'melodrama'}
+        )
+        assert self.titles(anon_client, genre='dram') == []
+
+    def test_several_genres_any_and_all(self, anon_client, catalog):
+        found = self.titles(anon_client, genre='drama,melodrama')
+        assert len(found) == len(set(found)) == len(catalog['titles'])
+
+        found = self.titles(anon_client, genre='drama,comedy')
+        assert len(found) == len(set(found))
+        found = self.titles(
+            anon_client, genre='drama,comedy', genre_match='all'
+        )
+        assert set(found) == self.expected(catalog['titles'], {'drama'})
+        assert self.titles(
+            anon_client, genre='drama,melodrama', genre_match='all'
+        ) == []
+
+    def test_category_accepts_several_slugs(self, anon_client, catalog):
+        assert len(self.titles(anon_client, category='movie')) == 6
+        assert len(self.titles(anon_client, category='movie,book')) == 12
+        assert self.titles(anon_client, category='mov') == []
+
+    def test_genre_filter_query_has_no_distinct(self, anon_client, catalog):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as context:
+            self.titles(anon_client, genre='drama,comedy', category='movie')
+        assert not any(
+            'DISTINCT' in query['sql'] for query in context.captured_queries
+        )
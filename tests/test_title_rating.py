@@ -0,0 +1,74 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+
+@pytest.mark.django_db
+class TestTitleRating:
+
+    def test_rating_follows_review_writes(self, user_client, user, catalog):
+        title = catalog['titles'][-1]
+        url = f'/api/v1/titles/{title.id}/reviews/'
+
+        response = user_client.post(url, {'text': 'Отзыв', 'score': 7})
+        assert response.status_code == 201
+        title.refresh_from_db()
+        assert (title.rating, title.reviews_count) == (7, 1)
+
+        review_id = response.json()['id']
+        response = user_client.patch(f'{url}{review_id}/', {'score': 3})
+        assert response.status_code == 200
+        title.refresh_from_db()
+        assert (title.rating, title.reviews_count) == (3, 1)
+
+        response = user_client.delete(f'{url}{review_id}/')
+        assert response.status_code == 204
+        title.refresh_from_db()
+        assert (title.rating, title.reviews_count) == (None, 0)
+
+    def test_rating_matches_aggregate(self, anon_client, catalog):
+        from django.db.models import Avg, Count
+        from reviews.models import Title
+
+        expected = {
+            pk: (rating, count) for pk, rating, count in
+            Title.objects.annotate(
+                avg=Avg('reviews__score'), count=Count('reviews')
+            ).values_list('id', 'avg', 'count')
+        }
+        stored = {
+            pk: (rating, count) for pk, rating, count in
+            Title.objects.values_list('id', 'rating', 'reviews_count')
+        }
+        assert stored == expected
+
+        response = anon_client.get('/api/v1/titles/?ordering=-rating')
+        ratings = [title['rating'] for title in response.json()['results']]
+        assert ratings == sorted(ratings, reverse=True)
+
+        response = anon_client.get('/api/v1/titles/?min_rating=5')
+        assert all(
+            title['rating'] >= 5 for title in response.json()['results']
+        )
+
+    def test_update_ratings_command(self, catalog):
+        from reviews.models import Title
+
+        title = catalog['titles'][0]
+        title.refresh_from_db()
+        expected = (title.rating, title.reviews_count)
+        call_command('update_ratings', '--check')
+
+        Title.objects.filter(pk=title.pk).update(rating=1, reviews_count=42)
+        with pytest.raises(CommandError):
+            call_command('update_ratings', '--check')
+
+        call_command('update_ratings')
+        title.refresh_from_db()
+        assert (title.rating, title.reviews_count) == expected
+        call_command('update_ratings', '--check')
+
+        Title.objects.filter(pk=title.pk).update(score_10=42)
+        with pytest.raises(CommandError):
+            call_command('update_ratings', '--check')
+        call_command('update_ratings')
+        call_command('update_ratings', '--check')
@@ -0,0 +1,34 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestTitlesQueries:
+
+    @pytest.mark.parametrize('page_size', [1, 5, 12])
+    def test_titles_list_query_count(self, anon_client, catalog,
+                                     django_assert_num_queries, monkeypatch,
+                                     page_size):
+        monkeypatch.setattr(
+            'rest_framework.pagination.PageNumberPagination.page_size',
+            page_size,
+        )
+        # COUNT для пагинации, страница произведений с категориями, жанры
+        with django_assert_num_queries(3):
+            response = anon_client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert len(results) == page_size
+        assert all(title['category'] for title in results)
+        assert all(title['genre'] for title in results)
+
+    def test_title_detail_query_count(self, anon_client, catalog,
+                                      django_assert_num_queries):
+        title = catalog['titles'][1]
+        with django_assert_num_queries(2):
+            response = anon_client.get(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == 200
+        data = response.json()
+        assert data['category'] == {'name': 'Фильм', 'slug': 'movie'}
+        assert {genre['slug'] for genre in data['genre']} == {
+            'drama', 'comedy'
+        }